@@ -2,56 +2,255 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import CONF_SCAN_INTERVAL, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, SCAN_INTERVAL
-from .modbus import SolakonModbusHub
+from .const import (
+    CONF_BACKGROUND_SETUP,
+    CONF_CONTROL_DEADBAND,
+    CONF_CONTROL_HYSTERESIS,
+    CONF_CONTROL_INTERVAL,
+    CONF_CONTROL_METER,
+    CONF_CONTROL_RAMP_RATE,
+    CONF_CONTROL_TARGET,
+    CONF_DEVICE_INFO,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_MAX_READ_GAP,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PIPELINE_DEPTH,
+    CONF_SAMPLE_INTERVAL,
+    DEFAULT_BACKGROUND_SETUP,
+    DEFAULT_CONTROL_DEADBAND,
+    DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_CONTROL_RAMP_RATE,
+    DEFAULT_CONTROL_TARGET,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PIPELINE_DEPTH,
+    DEFAULT_SAMPLE_INTERVAL,
+    DOMAIN,
+    SCAN_INTERVAL,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    TRANSPORT_TCP,
+)
+from .control import ZeroExportController
+from .entity import build_device_info
+from .modbus import SolakonModbusHub, async_pop_pending_hub, connection_options
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.NUMBER, Platform.SWITCH]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+    Platform.NUMBER,
+    Platform.SWITCH,
+]
+
+
+def _entry_option(entry: ConfigEntry, key: str, default: Any) -> Any:
+    """Return an option, falling back to the value given during setup."""
+    return entry.options.get(key, entry.data.get(key, default))
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Solakon ONE from a config entry."""
-    hub = SolakonModbusHub(
+    # Adopt the connection already probed by the config flow, if any
+    hub = async_pop_pending_hub(hass, entry.unique_id) or SolakonModbusHub(
         hass,
-        entry.data["host"],
-        entry.data["port"],
-        entry.data.get("slave_id", 1),
-        entry.data.get("scan_interval", SCAN_INTERVAL),
+        slave_id=entry.data.get("slave_id", 1),
+        scan_interval=_entry_option(entry, CONF_SCAN_INTERVAL, SCAN_INTERVAL),
+        max_read_gap=_entry_option(entry, CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP),
+        fast_scan_interval=_entry_option(
+            entry, CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+        ),
+        device_info=entry.data.get(CONF_DEVICE_INFO),
+        pipeline_depth=_entry_option(
+            entry, CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH
+        ),
+        **connection_options(entry.data),
     )
+    # Options are applied here as well, a hub adopted from the config flow
+    # was created before any option existed
+    _apply_poll_options(hub, entry)
 
-    await hub.async_setup()
-
-    if not await hub.async_test_connection():
-        raise ConfigEntryNotReady("Cannot connect to Solakon ONE device")
+    coordinator = SolakonDataCoordinator(hass, hub, entry.entry_id)
+    # With a recent snapshot the entities start from it and connecting and
+    # the first poll run in the background, otherwise setup waits for the
+    # device unless background setup is enabled
+    restored = await coordinator.async_restore_snapshot()
+    background = restored or entry.options.get(
+        CONF_BACKGROUND_SETUP, DEFAULT_BACKGROUND_SETUP
+    )
+    if not background:
+        if not await hub.async_test_connection():
+            await hub.async_close()
+            raise ConfigEntryNotReady("Cannot connect to Solakon ONE device")
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await hub.async_close()
+            raise
+    elif not restored:
+        # Entities register as unavailable until the first poll lands
+        coordinator.last_update_success = False
 
-    coordinator = SolakonDataCoordinator(hass, hub)
-    await coordinator.async_config_entry_first_refresh()
+    if background:
+        # The identity is read with the static registers of the first poll
+        device_info = hub.device_info or {}
+    else:
+        device_info = await hub.async_get_device_info()
+        # Persist the device identity so later restarts do not have to read it
+        if (
+            hub.device_info is not None
+            and entry.data.get(CONF_DEVICE_INFO) != device_info
+        ):
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_DEVICE_INFO: device_info}
+            )
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "hub": hub,
         "coordinator": coordinator,
+        "controller": _async_start_controller(hass, entry, hub, coordinator),
+        "sampler": _async_start_sampler(hass, hub),
+        # Options in effect, so entry data updates do not restart anything
+        "options": dict(entry.options),
+        # Shared by all entities of the hub
+        "device_info": build_device_info(entry, device_info),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if background:
+        entry.async_on_unload(
+            coordinator.async_add_listener(
+                _async_identity_listener(hass, entry, hub)
+            )
+        )
+        # Connecting and retrying follow the reconnect backoff of the hub
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+def _apply_poll_options(hub: SolakonModbusHub, entry: ConfigEntry) -> None:
+    """Set the read gap, poll and sample intervals of a hub from the options."""
+    hub.set_max_read_gap(
+        _entry_option(entry, CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP)
+    )
+    hub.set_poll_intervals(
+        _entry_option(entry, CONF_SCAN_INTERVAL, SCAN_INTERVAL),
+        _entry_option(entry, CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+        entry.options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL),
+        entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+    )
+    hub.set_sample_interval(
+        entry.options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+    )
+
+
+@callback
+def _async_start_sampler(
+    hass: HomeAssistant, hub: SolakonModbusHub
+) -> CALLBACK_TYPE | None:
+    """Start sampling the fast power registers if enabled."""
+    if not hub.sample_interval:
+        return None
+
+    async def _async_sample(now: datetime) -> None:
+        await hub.async_sample()
+
+    return async_track_time_interval(
+        hass, _async_sample, timedelta(seconds=hub.sample_interval)
+    )
+
+
+def _async_identity_listener(
+    hass: HomeAssistant, entry: ConfigEntry, hub: SolakonModbusHub
+) -> CALLBACK_TYPE:
+    """Return a listener persisting the device identity once it was polled."""
+
+    @callback
+    def _async_update_identity() -> None:
+        device_info = hub.device_info
+        if device_info is None or entry.data.get(CONF_DEVICE_INFO) == device_info:
+            return
+
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_DEVICE_INFO: device_info}
+        )
+        device_registry = dr.async_get(hass)
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, entry.entry_id)}
+        ):
+            device_registry.async_update_device(
+                device.id,
+                model=device_info.get("model"),
+                sw_version=device_info.get("sw_version"),
+                serial_number=device_info.get("serial_number"),
+            )
+
+    return _async_update_identity
+
+
+@callback
+def _async_start_controller(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    hub: SolakonModbusHub,
+    coordinator: SolakonDataCoordinator,
+) -> ZeroExportController | None:
+    """Start the zero-export control loop if a meter is configured."""
+    if not (meter := entry.options.get(CONF_CONTROL_METER)):
+        return None
+
+    controller = ZeroExportController(
+        hass,
+        hub,
+        coordinator,
+        meter,
+        target=entry.options.get(CONF_CONTROL_TARGET, DEFAULT_CONTROL_TARGET),
+        deadband=entry.options.get(CONF_CONTROL_DEADBAND, DEFAULT_CONTROL_DEADBAND),
+        hysteresis=entry.options.get(
+            CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS
+        ),
+        ramp_rate=entry.options.get(
+            CONF_CONTROL_RAMP_RATE, DEFAULT_CONTROL_RAMP_RATE
+        ),
+        interval=entry.options.get(CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL),
+    )
+    controller.async_start()
+    return controller
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if controller := hass.data[DOMAIN][entry.entry_id].get("controller"):
+        controller.async_stop()
+    if unsubscribe_sampler := hass.data[DOMAIN][entry.entry_id].get("sampler"):
+        unsubscribe_sampler()
+
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hub = hass.data[DOMAIN][entry.entry_id]["hub"]
         await hub.async_close()
@@ -60,31 +259,163 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshot of a deleted config entry."""
+    await Store(hass, SNAPSHOT_STORAGE_VERSION, _snapshot_key(entry.entry_id)).async_remove()
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running hub and coordinator."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if entry.options == entry_data["options"]:
+        # Only the entry data changed, such as the stored device identity
+        return
+    entry_data["options"] = dict(entry.options)
+    hub: SolakonModbusHub = entry_data["hub"]
+    coordinator: SolakonDataCoordinator = entry_data["coordinator"]
+
+    if hub.transport == TRANSPORT_TCP and (
+        _entry_option(entry, CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH)
+        != hub.pipeline_depth
+    ):
+        # Hubs hand their depth to the shared connection when created, so
+        # only this change needs a full reload
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _apply_poll_options(hub, entry)
+    coordinator.update_interval = timedelta(seconds=hub.update_interval)
+
+    if controller := entry_data.get("controller"):
+        controller.async_stop()
+    entry_data["controller"] = _async_start_controller(
+        hass, entry, hub, coordinator
+    )
+    if unsubscribe_sampler := entry_data.get("sampler"):
+        unsubscribe_sampler()
+    entry_data["sampler"] = _async_start_sampler(hass, hub)
+
+    # Refresh now so the new interval is used for scheduling right away
+    await coordinator.async_request_refresh()
+
+
+def _snapshot_key(entry_id: str) -> str:
+    """Return the storage key of the snapshot of a config entry."""
+    return f"{DOMAIN}.{entry_id}.snapshot"
 
 
 class SolakonDataCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from Solakon ONE."""
 
-    def __init__(self, hass: HomeAssistant, hub: SolakonModbusHub) -> None:
+    def __init__(
+        self, hass: HomeAssistant, hub: SolakonModbusHub, entry_id: str
+    ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name="Solakon ONE",
-            update_interval=timedelta(seconds=hub.scan_interval),
+            update_interval=timedelta(seconds=hub.update_interval),
         )
         self.hub = hub
+        # Keys whose value changed with the latest update, so entities can
+        # skip state writes for values that stayed the same
+        self.changed_keys: frozenset[str] = frozenset()
+        # Set while the data was restored from the snapshot and no live poll
+        # has confirmed it yet
+        self.stale = False
+        self.polled_at: datetime | None = None
+        # A delayed save restarts its delay on every call, so only one is
+        # scheduled at a time
+        self._save_scheduled = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, _snapshot_key(entry_id)
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Start from the persisted snapshot, return whether one was used."""
+        try:
+            stored = await self._store.async_load()
+        except HomeAssistantError as err:
+            _LOGGER.warning(f"Ignoring unreadable snapshot: {err}")
+            return False
+        if not stored or not stored.get("data"):
+            return False
+
+        polled_at = dt_util.parse_datetime(stored.get("polled_at") or "")
+        if polled_at is None or dt_util.utcnow() - polled_at > timedelta(
+            seconds=SNAPSHOT_MAX_AGE
+        ):
+            _LOGGER.debug("Ignoring outdated snapshot")
+            return False
+
+        self.data = stored["data"]
+        self.changed_keys = frozenset(self.data)
+        self.polled_at = polled_at
+        self.stale = True
+        _LOGGER.debug(f"Restored {len(self.data)} values polled at {polled_at}")
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        self._save_scheduled = False
+        return {
+            "polled_at": self.polled_at.isoformat() if self.polled_at else None,
+            "data": self.data,
+        }
+
+    def _diff(self, data: dict[str, Any]) -> frozenset[str]:
+        """Return the keys of ``data`` that differ from the current data."""
+        previous = self.data or {}
+        return frozenset(
+            key
+            for key, value in data.items()
+            if key not in previous or previous[key] != value
+        )
+
+    @callback
+    def async_merge_data(self, data: dict[str, Any]) -> None:
+        """Merge values read outside a poll and notify listeners.
+
+        Unlike async_set_updated_data this leaves the poll schedule alone.
+        """
+        if not data:
+            return
+        self.changed_keys = self._diff(data)
+        self.data = {**(self.data or {}), **data}
+        self.async_update_listeners()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from Solakon ONE."""
+        self.changed_keys = frozenset()
+        if self.hub.circuit_open:
+            # Fail fast instead of waiting for another connect timeout
+            health = self.hub.connection_health
+            raise UpdateFailed(
+                f"Device unreachable ({health['last_error']}), "
+                f"retrying in {health['retry_in']:.0f}s"
+            )
+
         try:
             data = await self.hub.async_read_all_data()
             if not data:
                 raise UpdateFailed("Failed to fetch data from device")
-            return data
+            self.changed_keys = self._diff(data)
         except Exception as err:
             raise UpdateFailed(f"Error communicating with device: {err}") from err
+
+        if self.stale:
+            # Every restored value is confirmed or replaced now
+            self.stale = False
+            self.changed_keys = frozenset(data) | frozenset(self.data or {})
+        self.polled_at = dt_util.utcnow()
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+        # Follow adaptive polling, the next refresh is scheduled after return
+        interval = timedelta(seconds=self.hub.update_interval)
+        if interval != self.update_interval:
+            self.update_interval = interval
+        return data
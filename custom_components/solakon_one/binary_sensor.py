@@ -0,0 +1,145 @@
+"""Binary sensor platform for Solakon ONE integration."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import BINARY_SENSOR_DEFINITIONS, BITFIELD_BITS, DOMAIN, REGISTERS
+from .entity import SolakonEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a Solakon ONE status or alarm bit."""
+
+    register: str
+    bit: int | None = None
+
+
+def _build_descriptions() -> tuple[SolakonBinarySensorEntityDescription, ...]:
+    """Compile the binary sensor definitions into entity descriptions."""
+    descriptions = []
+    for key, definition in BINARY_SENSOR_DEFINITIONS.items():
+        if definition["register"] not in REGISTERS:
+            _LOGGER.warning(
+                "Skipping binary sensor %s: register %s not defined",
+                key,
+                definition["register"],
+            )
+            continue
+        device_class = definition.get("device_class")
+        descriptions.append(
+            SolakonBinarySensorEntityDescription(
+                key=key,
+                name=definition["name"],
+                icon=definition.get("icon"),
+                device_class=(
+                    BinarySensorDeviceClass(device_class) if device_class else None
+                ),
+                register=definition["register"],
+                bit=definition.get("bit"),
+            )
+        )
+    return tuple(descriptions)
+
+
+BINARY_SENSOR_DESCRIPTIONS = _build_descriptions()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Solakon ONE binary sensor entities."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = data["coordinator"]
+    device_info = data["device_info"]
+
+    async_add_entities(
+        SolakonBinarySensor(coordinator, config_entry, description, device_info)
+        for description in BINARY_SENSOR_DESCRIPTIONS
+    )
+
+
+class SolakonBinarySensor(SolakonEntity, BinarySensorEntity):
+    """Representation of a Solakon ONE status or alarm bit."""
+
+    entity_description: SolakonBinarySensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        description: SolakonBinarySensorEntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, config_entry, description, device_info)
+        self._register_key = description.register
+        self._bit_names = BITFIELD_BITS.get(
+            self._register_key, tuple(f"bit_{bit}" for bit in range(16))
+        )
+        # Bits this entity follows, every bit when no single bit is given
+        self._mask = 0xFFFF if description.bit is None else 1 << description.bit
+        self.entity_id = f"binary_sensor.solakon_one_{description.key}"
+
+        self._bits: int | None = None
+        self._apply_bits(self._read_bits())
+
+    def _read_bits(self) -> int | None:
+        """Return the followed bits of the register, None when unknown."""
+        value = (self.coordinator.data or {}).get(self._register_key)
+        if value is None:
+            return None
+        return int(value) & self._mask
+
+    def _apply_bits(self, bits: int | None) -> None:
+        """Update the state and attributes from the followed bits."""
+        self._bits = bits
+        self._attr_is_on = None if bits is None else bits != 0
+        if self._mask == 0xFFFF:
+            self._attr_extra_state_attributes = {
+                "active_bits": [
+                    name
+                    for bit, name in enumerate(self._bit_names)
+                    if bits and bits >> bit & 1
+                ]
+            }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when a followed bit flipped."""
+        status_changed = self._status_changed()
+
+        if (
+            not status_changed
+            and self._register_key not in self.coordinator.changed_keys
+        ):
+            return
+
+        bits = self._read_bits()
+        if not status_changed and bits == self._bits:
+            # Only bits this entity does not follow changed
+            return
+
+        self._apply_bits(bits)
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success and self._bits is not None
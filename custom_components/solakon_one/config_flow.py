@@ -11,24 +11,99 @@ from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTER
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, selector
 
-from .const import DEFAULT_NAME, DEFAULT_PORT, DEFAULT_SCAN_INTERVAL, DEFAULT_SLAVE_ID, DOMAIN
-from .modbus import SolakonModbusHub
+from .const import (
+    BAUDRATES,
+    CONF_BACKGROUND_SETUP,
+    CONF_BAUDRATE,
+    CONF_CONTROL_DEADBAND,
+    CONF_CONTROL_HYSTERESIS,
+    CONF_CONTROL_INTERVAL,
+    CONF_CONTROL_METER,
+    CONF_CONTROL_RAMP_RATE,
+    CONF_CONTROL_TARGET,
+    CONF_DEVICE_INFO,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_MAX_READ_GAP,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PARITY,
+    CONF_PIPELINE_DEPTH,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SERIAL_PORT,
+    CONF_STOPBITS,
+    CONF_TRANSPORT,
+    DEFAULT_BACKGROUND_SETUP,
+    DEFAULT_BAUDRATE,
+    DEFAULT_CONTROL_DEADBAND,
+    DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_CONTROL_RAMP_RATE,
+    DEFAULT_CONTROL_TARGET,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_PARITY,
+    DEFAULT_PIPELINE_DEPTH,
+    DEFAULT_PORT,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLAVE_ID,
+    DEFAULT_STOPBITS,
+    DOMAIN,
+    MAX_PIPELINE_DEPTH,
+    MAX_READ_REGISTERS,
+    TRANSPORT_RTU_OVER_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+)
+from .modbus import SolakonModbusHub, async_store_pending_hub, connection_options
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
+# Fields shared by all transports
+STEP_DEVICE_DATA_SCHEMA = {
+    vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
+    vol.Optional("slave_id", default=DEFAULT_SLAVE_ID): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=247)
+    ),
+    vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+        vol.Coerce(int), vol.Range(min=10, max=300)
+    ),
+    vol.Optional(
+        CONF_FAST_SCAN_INTERVAL, default=DEFAULT_FAST_SCAN_INTERVAL
+    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+}
+
+STEP_NETWORK_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
         vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
-        vol.Optional("slave_id", default=DEFAULT_SLAVE_ID): vol.All(
-            vol.Coerce(int), vol.Range(min=1, max=247)
+        vol.Optional(CONF_TRANSPORT, default=TRANSPORT_TCP): vol.In(
+            {
+                TRANSPORT_TCP: "Modbus TCP",
+                TRANSPORT_RTU_OVER_TCP: "Modbus RTU over TCP",
+            }
         ),
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
-            vol.Coerce(int), vol.Range(min=10, max=300)
+        **STEP_DEVICE_DATA_SCHEMA,
+        vol.Optional(CONF_PIPELINE_DEPTH, default=DEFAULT_PIPELINE_DEPTH): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PIPELINE_DEPTH)
+        ),
+    }
+)
+
+STEP_SERIAL_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SERIAL_PORT): str,
+        vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.In(BAUDRATES),
+        vol.Optional(CONF_PARITY, default=DEFAULT_PARITY): vol.In(
+            {"N": "None", "E": "Even", "O": "Odd"}
         ),
+        vol.Optional(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.In([1, 2]),
+        **STEP_DEVICE_DATA_SCHEMA,
     }
 )
 
@@ -37,26 +112,32 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate the user input allows us to connect."""
     hub = SolakonModbusHub(
         hass,
-        data[CONF_HOST],
-        data[CONF_PORT],
-        data.get("slave_id", DEFAULT_SLAVE_ID),
-        data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        slave_id=data.get("slave_id", DEFAULT_SLAVE_ID),
+        scan_interval=data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        fast_scan_interval=data.get(
+            CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+        ),
+        pipeline_depth=data.get(CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH),
+        **connection_options(data),
     )
 
-    await hub.async_setup()
-    
     if not await hub.async_test_connection():
         await hub.async_close()
         raise CannotConnect("Cannot connect to device")
 
     try:
-        info = await hub.async_get_device_info()
-        await hub.async_close()
+        await hub.async_get_device_info()
     except Exception as err:
         await hub.async_close()
         raise CannotConnect(f"Failed to get device info: {err}") from err
 
-    return {"title": data.get(CONF_NAME, DEFAULT_NAME), "device_info": info}
+    # The connected hub is handed over to the entry setup instead of closed.
+    # Only the identity actually read from the device is cached in the entry.
+    return {
+        "title": data.get(CONF_NAME, DEFAULT_NAME),
+        "device_info": hub.device_info,
+        "hub": hub,
+    }
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -68,26 +149,64 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["network", "serial"])
+
+    async def async_step_network(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a device reached over the network."""
         errors: dict[str, str] = {}
         if user_input is not None:
-            try:
-                info = await validate_input(self.hass, user_input)
-            except CannotConnect:
-                errors["base"] = "cannot_connect"
-            except Exception:
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
-            else:
-                await self.async_set_unique_id(
-                    f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}:{user_input.get('slave_id', DEFAULT_SLAVE_ID)}"
-                )
-                self._abort_if_unique_id_configured()
-                return self.async_create_entry(title=info["title"], data=user_input)
+            if user_input.get(CONF_TRANSPORT) == TRANSPORT_RTU_OVER_TCP:
+                # RTU frames cannot be pipelined
+                user_input.pop(CONF_PIPELINE_DEPTH, None)
+            unique_id = f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}:{user_input.get('slave_id', DEFAULT_SLAVE_ID)}"
+            result = await self._async_create_entry(unique_id, user_input, errors)
+            if result is not None:
+                return result
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="network", data_schema=STEP_NETWORK_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a device wired to a local RS485 serial port."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            user_input[CONF_TRANSPORT] = TRANSPORT_SERIAL
+            unique_id = f"{user_input[CONF_SERIAL_PORT]}:{user_input.get('slave_id', DEFAULT_SLAVE_ID)}"
+            result = await self._async_create_entry(unique_id, user_input, errors)
+            if result is not None:
+                return result
+
+        return self.async_show_form(
+            step_id="serial", data_schema=STEP_SERIAL_DATA_SCHEMA, errors=errors
+        )
+
+    async def _async_create_entry(
+        self, unique_id: str, user_input: dict[str, Any], errors: dict[str, str]
+    ) -> FlowResult | None:
+        """Validate the input and create the entry, None if it failed."""
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured()
+
+        try:
+            info = await validate_input(self.hass, user_input)
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except Exception:
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        else:
+            async_store_pending_hub(self.hass, unique_id, info["hub"])
+            entry_data = dict(user_input)
+            if info["device_info"] is not None:
+                entry_data[CONF_DEVICE_INFO] = info["device_info"]
+            return self.async_create_entry(title=info["title"], data=entry_data)
+        return None
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -111,20 +230,109 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        return self.async_show_form(
-            step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Optional(
-                        CONF_SCAN_INTERVAL,
-                        default=self.config_entry.data.get(
-                            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-                        ),
-                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
-                }
-            ),
+        options = self.config_entry.options
+        schema = {
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_SCAN_INTERVAL,
+                    self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
+            vol.Optional(
+                CONF_FAST_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_FAST_SCAN_INTERVAL,
+                    self.config_entry.data.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Optional(
+                CONF_IDLE_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=900)),
+            vol.Optional(
+                CONF_MIN_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Optional(
+                CONF_SAMPLE_INTERVAL,
+                default=options.get(
+                    CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+            vol.Optional(
+                CONF_MAX_READ_GAP,
+                default=options.get(
+                    CONF_MAX_READ_GAP,
+                    self.config_entry.data.get(CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_READ_REGISTERS)),
+        }
+        if self.config_entry.data.get(CONF_TRANSPORT, TRANSPORT_TCP) == TRANSPORT_TCP:
+            schema[
+                vol.Optional(
+                    CONF_PIPELINE_DEPTH,
+                    default=options.get(
+                        CONF_PIPELINE_DEPTH,
+                        self.config_entry.data.get(CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH),
+                    ),
+                )
+            ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_PIPELINE_DEPTH))
+        schema.update(
+            {
+                vol.Optional(
+                    CONF_BACKGROUND_SETUP,
+                    default=options.get(
+                        CONF_BACKGROUND_SETUP, DEFAULT_BACKGROUND_SETUP
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_CONTROL_METER,
+                    description={
+                        "suggested_value": options.get(CONF_CONTROL_METER)
+                    },
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="sensor")
+                ),
+                vol.Optional(
+                    CONF_CONTROL_TARGET,
+                    default=options.get(
+                        CONF_CONTROL_TARGET, DEFAULT_CONTROL_TARGET
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=-10000, max=10000)),
+                vol.Optional(
+                    CONF_CONTROL_DEADBAND,
+                    default=options.get(
+                        CONF_CONTROL_DEADBAND, DEFAULT_CONTROL_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_CONTROL_HYSTERESIS,
+                    default=options.get(
+                        CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_CONTROL_RAMP_RATE,
+                    default=options.get(
+                        CONF_CONTROL_RAMP_RATE, DEFAULT_CONTROL_RAMP_RATE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=10, max=50000)),
+                vol.Optional(
+                    CONF_CONTROL_INTERVAL,
+                    default=options.get(
+                        CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+            }
         )
 
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
\ No newline at end of file
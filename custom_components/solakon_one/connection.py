@@ -0,0 +1,817 @@
+"""Shared Modbus connections for Solakon ONE."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusIOException
+from pymodbus.framer import FramerType
+
+from .const import (
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    MAX_PIPELINE_DEPTH,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+    TRANSPORT_RTU_OVER_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+)
+from .metrics import PollMetrics
+from .pipeline import PipelinedModbusTcpClient
+from .registers import DecodeBatch
+
+_LOGGER = logging.getLogger(__name__)
+
+# Circuit breaker states
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Request priorities, lower values are sent first
+PRIORITY_WRITE = 0
+PRIORITY_READBACK = 1
+PRIORITY_READ = 2
+PRIORITY_SAMPLE = 3
+
+# Errors raised when a request got no answer in time
+TIMEOUT_ERRORS = (asyncio.TimeoutError, TimeoutError, ModbusIOException)
+
+# Modbus exception code for a function the slave does not implement
+ILLEGAL_FUNCTION = 1
+
+# Above this baud rate the RTU inter-frame gap is fixed at 1.75 ms instead of
+# 3.5 character times
+RTU_FIXED_GAP_BAUDRATE = 19200
+RTU_FIXED_GAP = 0.00175
+
+# Process-wide connections keyed by "host:port" or serial device, shared by
+# every hub that talks to a device behind the same gateway or on the same bus
+_CONNECTIONS: dict[str, SolakonConnection] = {}
+
+
+class SerialSettings:
+    """Line settings of an RS485 serial port."""
+
+    __slots__ = ("baudrate", "bytesize", "parity", "stopbits")
+
+    def __init__(
+        self,
+        baudrate: int = DEFAULT_BAUDRATE,
+        parity: str = DEFAULT_PARITY,
+        stopbits: int = DEFAULT_STOPBITS,
+        bytesize: int = 8,
+    ) -> None:
+        """Initialize the settings."""
+        self.baudrate = baudrate
+        self.bytesize = bytesize
+        self.parity = parity
+        self.stopbits = stopbits
+
+    @property
+    def frame_gap(self) -> float:
+        """Return the silence in seconds required between two RTU frames."""
+        if self.baudrate > RTU_FIXED_GAP_BAUDRATE:
+            return RTU_FIXED_GAP
+        # Start bit, data bits, parity bit and stop bits of one character
+        bits = 1 + self.bytesize + (self.parity != "N") + self.stopbits
+        return 3.5 * bits / self.baudrate
+
+
+def connection_key(host: str, port: int | None, transport: str) -> str:
+    """Return the registry key of the connection to a gateway or port."""
+    if transport == TRANSPORT_SERIAL:
+        return host
+    if transport == TRANSPORT_RTU_OVER_TCP:
+        return f"rtu://{host}:{port}"
+    return f"{host}:{port}"
+
+
+def get_connection(
+    host: str,
+    port: int | None,
+    slave_id: int,
+    pipeline_depth: int = 1,
+    transport: str = TRANSPORT_TCP,
+    serial_settings: SerialSettings | None = None,
+) -> SolakonConnection:
+    """Return the shared connection for a gateway, creating it if needed."""
+    key = connection_key(host, port, transport)
+    if (connection := _CONNECTIONS.get(key)) is None:
+        connection = _CONNECTIONS[key] = SolakonConnection(
+            host, port, transport, serial_settings
+        )
+    connection.request_pipeline_depth(pipeline_depth)
+    connection.users += 1
+    connection.slave_ids.append(slave_id)
+    return connection
+
+
+async def async_release_connection(
+    connection: SolakonConnection, slave_id: int, pipeline_depth: int = 1
+) -> None:
+    """Release a shared connection and close it once nobody uses it.
+
+    ``pipeline_depth`` is the depth the hub passed to get_connection.
+    """
+    connection.users -= 1
+    connection.slave_ids.remove(slave_id)
+    connection.record_answer(slave_id)
+    connection.withdraw_pipeline_depth(pipeline_depth)
+    if connection.users > 0:
+        return
+    if _CONNECTIONS.get(connection.key) is connection:
+        _CONNECTIONS.pop(connection.key)
+    await connection.async_close()
+
+
+class CircuitBreaker:
+    """Pace reconnect attempts with jittered exponential backoff.
+
+    The circuit is closed while the device answers. A failed connection opens
+    it until the backoff delay has passed, after which a single half-open
+    attempt decides whether it closes again or reopens with a longer delay.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = RECONNECT_MIN_DELAY,
+        max_delay: float = RECONNECT_MAX_DELAY,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.last_error: str | None = None
+        self._retry_at = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next attempt is allowed."""
+        if self.state != CIRCUIT_OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def allow_attempt(self) -> bool:
+        """Return whether a connection attempt may be made now."""
+        if self.state == CIRCUIT_OPEN and self.retry_in <= 0:
+            self.state = CIRCUIT_HALF_OPEN
+        return self.state != CIRCUIT_OPEN
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful exchange."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Connection to device restored")
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.last_error = None
+
+    def record_failure(self, err: Exception | str) -> None:
+        """Open the circuit and schedule the next attempt."""
+        self.failures += 1
+        self.last_error = str(err)
+        delay = min(self._max_delay, self._min_delay * 2 ** (self.failures - 1))
+        # Jitter keeps several hubs from reconnecting in lockstep
+        delay *= random.uniform(0.5, 1.0)
+        self._retry_at = time.monotonic() + delay
+        self.state = CIRCUIT_OPEN
+        _LOGGER.debug(
+            f"Connection failure {self.failures} ({err}), retrying in {delay:.1f}s"
+        )
+
+
+class PrioritySlots:
+    """A semaphore that hands free slots to the most urgent waiter first.
+
+    Waiters of equal priority are served in arrival order.
+    """
+
+    def __init__(self, slots: int) -> None:
+        """Initialize the slots."""
+        self._capacity = slots
+        self._free = slots
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a free slot."""
+        if self._free > 0 and not self.queued:
+            self._free -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot and wake the most urgent waiter."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free += 1
+
+    async def acquire_all(self, priority: int) -> None:
+        """Wait until every slot is free and hold all of them."""
+        held = 0
+        try:
+            for _ in range(self._capacity):
+                await self.acquire(priority)
+                held += 1
+        except BaseException:
+            for _ in range(held):
+                self.release()
+            raise
+
+    def release_all(self, slots: int) -> None:
+        """Return the slots held by acquire_all, resized to ``slots``."""
+        self._capacity = slots
+        for _ in range(slots):
+            self.release()
+
+    def resize(self, slots: int) -> None:
+        """Change the number of slots, waking waiters if it grew."""
+        self._free += slots - self._capacity
+        self._capacity = slots
+        while self._free > 0 and self.queued:
+            self._free -= 1
+            self.release()
+
+
+class _QueuedWrite:
+    """A write waiting for a slot, updated in place by later writes."""
+
+    __slots__ = ("values", "future")
+
+    def __init__(self, values: list[int]) -> None:
+        """Initialize the queued write."""
+        self.values = values
+        self.future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+
+
+class SolakonConnection:
+    """A Modbus connection shared by all slave IDs behind one gateway or bus.
+
+    Every request takes a connection slot on its own, so hubs polling
+    different slave IDs interleave their requests in arrival order instead
+    of one hub holding the link for a whole poll. With pipelining enabled
+    and verified, several slots can be in flight at the same time.
+
+    Writes and their readbacks are scheduled ahead of queued poll reads, so
+    a setpoint change waits for at most the requests already in flight. A
+    write to a register that already has a write queued replaces the queued
+    value instead of adding a second request, and both callers receive the
+    result.
+
+    RTU transports carry no transaction IDs, so they always keep a single
+    request in flight. On a serial port the line is kept silent for the
+    inter-frame gap of its baud rate between a reply and the next request.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None,
+        transport: str = TRANSPORT_TCP,
+        serial_settings: SerialSettings | None = None,
+    ) -> None:
+        """Initialize the connection."""
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.serial_settings = serial_settings or SerialSettings()
+        self.users = 0
+        # Slave IDs of the hubs using the connection and those whose last
+        # requests timed out
+        self.slave_ids: list[int] = []
+        self._silent_slaves: set[int] = set()
+        # Incremented on every successful connect so hubs can tell when
+        # their probe belongs to an earlier connection
+        self.generation = 0
+        self.circuit = CircuitBreaker()
+        self._client: (
+            AsyncModbusTcpClient
+            | AsyncModbusSerialClient
+            | PipelinedModbusTcpClient
+            | None
+        ) = None
+        self._connect_lock = asyncio.Lock()
+        # Requested and verified number of transactions in flight, the depth
+        # asked for by each hub and the depth the open client was made for
+        self.pipeline_depth = 1
+        self.active_depth = 1
+        self._pipeline_checked = False
+        self._depth_requests: list[int] = []
+        self._client_depth = 1
+        self._slots = PrioritySlots(1)
+        self._queued_writes: dict[tuple[int, int, int], _QueuedWrite] = {}
+        self.decode_batch = DecodeBatch()
+        # Whether each slave implements mask write, absent until tried
+        self._mask_write: dict[int, bool] = {}
+        self._frame_gap = (
+            self.serial_settings.frame_gap if transport == TRANSPORT_SERIAL else 0.0
+        )
+        # Time before which the serial line has to stay silent
+        self._quiet_until = 0.0
+
+    def request_pipeline_depth(self, depth: int) -> None:
+        """Add the pipeline depth asked for by a hub joining the connection."""
+        self._depth_requests.append(depth)
+        self._update_pipeline_depth()
+
+    def withdraw_pipeline_depth(self, depth: int) -> None:
+        """Remove the pipeline depth asked for by a hub leaving the connection."""
+        self._depth_requests.remove(depth)
+        self._update_pipeline_depth()
+
+    def _update_pipeline_depth(self) -> None:
+        """Try the deepest pipeline any hub on the connection asks for.
+
+        The depth decides the client type, so an open connection is reopened
+        by the next async_connect and the new depth is verified again.
+        """
+        if self.transport != TRANSPORT_TCP:
+            # Replies could not be told apart without transaction IDs
+            return
+        depth = min(max(self._depth_requests, default=1), MAX_PIPELINE_DEPTH)
+        if depth != self.pipeline_depth:
+            self.pipeline_depth = depth
+            self._pipeline_checked = False
+
+    @property
+    def key(self) -> str:
+        """Return the registry key of the connection."""
+        return connection_key(self.host, self.port, self.transport)
+
+    @property
+    def connected(self) -> bool:
+        """Check if client is connected."""
+        return self._client is not None and self._client.connected
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return whether reconnect attempts are currently backed off."""
+        return self.circuit.state == CIRCUIT_OPEN and self.circuit.retry_in > 0
+
+    async def async_connect(self) -> None:
+        """Open the connection unless it is already up.
+
+        A connection opened for another pipeline depth than the one now
+        requested is reopened, even while it is up.
+        """
+        async with self._connect_lock:
+            depth_changed = self._client_depth != self.pipeline_depth
+            if self.connected and not depth_changed:
+                return
+            if not self.connected and not self.circuit.allow_attempt():
+                raise CircuitOpenError(
+                    f"Reconnect to {self.key} backed off for "
+                    f"{self.circuit.retry_in:.0f}s"
+                )
+            if not depth_changed:
+                await self._async_open()
+                return
+
+            # The client type depends on the depth, so wait until no request
+            # is in flight before replacing it
+            await self._slots.acquire_all(PRIORITY_WRITE)
+            try:
+                await self._async_open()
+            finally:
+                # The new depth is verified by the next probe
+                self.active_depth = 1
+                self._slots.release_all(1)
+
+    async def _async_open(self) -> None:
+        """Create a client for the transport and connect it."""
+        # Never leave a previous client behind when reconnecting
+        await self.async_close()
+
+        try:
+            _LOGGER.info(f"Attempting to connect to Modbus {self.transport} at {self.key}")
+
+            if self.transport == TRANSPORT_SERIAL:
+                settings = self.serial_settings
+                self._client = AsyncModbusSerialClient(
+                    port=self.host,
+                    framer=FramerType.RTU,
+                    baudrate=settings.baudrate,
+                    bytesize=settings.bytesize,
+                    parity=settings.parity,
+                    stopbits=settings.stopbits,
+                    timeout=5,
+                )
+            elif self.transport == TRANSPORT_RTU_OVER_TCP:
+                self._client = AsyncModbusTcpClient(
+                    host=self.host,
+                    port=self.port,
+                    framer=FramerType.RTU,
+                    timeout=5,
+                )
+            elif self.pipeline_depth > 1:
+                self._client = PipelinedModbusTcpClient(
+                    self.host, self.port, self.pipeline_depth, timeout=5
+                )
+            else:
+                # Create client exactly like the working script
+                self._client = AsyncModbusTcpClient(
+                    host=self.host,
+                    port=self.port,
+                    timeout=5  # Same timeout as working script
+                )
+
+            # Connect to the device
+            await self._client.connect()
+
+            if not self._client.connected:
+                raise ConnectionError(f"Failed to connect to {self.key}")
+
+            _LOGGER.info(f"Successfully connected to {self.key}")
+            self._client_depth = self.pipeline_depth
+            self.generation += 1
+
+        except Exception as err:
+            if self.circuit.failures:
+                _LOGGER.debug(f"Connection setup error: {err}")
+            else:
+                _LOGGER.error(f"Connection setup error: {err}")
+            await self.async_close()
+            self.circuit.record_failure(err)
+            raise
+
+    async def async_detect_pipeline(self, slave_id: int, address: int) -> None:
+        """Find the deepest pipeline the gateway answers correctly.
+
+        The registers starting at ``address`` are read one by one and then
+        concurrently at decreasing depths. A depth is accepted only if every
+        concurrent reply arrives and matches the sequential read.
+        """
+        if self._pipeline_checked or self.pipeline_depth <= 1:
+            return
+        self._pipeline_checked = True
+
+        client = self._client
+        depth = self.pipeline_depth
+        # Hold the single slot so no other request interleaves with the probe
+        await self._slots.acquire(PRIORITY_WRITE)
+        try:
+            depth = await self._async_probe_depth(client, slave_id, address, depth)
+        finally:
+            self._slots.release()
+
+        self.active_depth = depth
+        self._slots.resize(depth)
+        _LOGGER.info(
+            f"Using pipeline depth {depth} on {self.key} "
+            f"(requested {self.pipeline_depth})"
+        )
+
+    @staticmethod
+    async def _async_probe_depth(
+        client: PipelinedModbusTcpClient, slave_id: int, address: int, depth: int
+    ) -> int:
+        """Return the deepest verified pipeline depth up to ``depth``."""
+        try:
+            expected = []
+            for offset in range(depth):
+                result = await client.read_holding_registers(
+                    address=address + offset, count=1, device_id=slave_id
+                )
+                expected.append(None if result.isError() else result.registers)
+
+            while depth > 1:
+                results = await asyncio.gather(
+                    *(
+                        client.read_holding_registers(
+                            address=address + offset, count=1, device_id=slave_id
+                        )
+                        for offset in range(depth)
+                    ),
+                    return_exceptions=True,
+                )
+                if all(
+                    not isinstance(result, Exception)
+                    and (None if result.isError() else result.registers)
+                    == expected[offset]
+                    for offset, result in enumerate(results)
+                ):
+                    break
+                depth //= 2
+        except Exception as err:
+            _LOGGER.debug(f"Pipeline probe failed: {err}")
+            return 1
+
+        return depth
+
+    @contextlib.asynccontextmanager
+    async def _async_frame(self) -> AsyncIterator[None]:
+        """Send one request inside the inter-frame gap of a serial line."""
+        if not self._frame_gap:
+            yield
+            return
+        if (delay := self._quiet_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        try:
+            yield
+        finally:
+            self._quiet_until = time.monotonic() + self._frame_gap
+
+    async def async_reset(self, err: Exception | str) -> None:
+        """Drop a connection that stopped answering and back off."""
+        await self.async_close()
+        self.circuit.record_failure(err)
+
+    def record_answer(self, slave_id: int) -> None:
+        """Note that a slave answered on this connection."""
+        self._silent_slaves.discard(slave_id)
+
+    async def async_record_failure(self, slave_id: int, err: Exception) -> None:
+        """Note a request to a slave that got no answer at all.
+
+        A timeout may only mean that this slave is offline behind a working
+        gateway, so the connection is dropped once no slave on it answers.
+        Any other error means the link itself failed.
+        """
+        if not isinstance(err, TIMEOUT_ERRORS):
+            if self._client is not None:
+                await self.async_reset(err)
+            return
+        self._silent_slaves.add(slave_id)
+        if self._silent_slaves.issuperset(self.slave_ids):
+            await self.async_reset(f"No slave on {self.key} answers: {err}")
+
+    async def async_close(self) -> None:
+        """Close the Modbus connection."""
+        if self._client:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    @property
+    def queued_requests(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return self._slots.queued
+
+    async def _async_send(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        count: int,
+        write: bool,
+        metrics: PollMetrics | None,
+    ) -> Any:
+        """Send one request inside its frame and record it in ``metrics``."""
+        async with self._async_frame():
+            if metrics is None:
+                return await request()
+            record = metrics.record_write if write else metrics.record_read
+            # Timed after the slot is taken so queueing is not counted
+            start = time.monotonic()
+            try:
+                result = await request()
+            except Exception as err:
+                record(time.monotonic() - start, count, False)
+                metrics.record_error(isinstance(err, TIMEOUT_ERRORS))
+                raise
+        record(time.monotonic() - start, count, True)
+        if result.isError():
+            metrics.record_error()
+        return result
+
+    async def async_read_holding_registers(
+        self,
+        slave_id: int,
+        address: int,
+        count: int,
+        priority: int = PRIORITY_READ,
+        metrics: PollMetrics | None = None,
+    ) -> Any:
+        """Read holding registers from one slave."""
+        await self._slots.acquire(priority)
+        try:
+            if self._client is None:
+                raise ConnectionError(f"Not connected to {self.key}")
+            return await self._async_send(
+                partial(
+                    self._client.read_holding_registers,
+                    address=address,
+                    count=count,
+                    device_id=slave_id
+                ),
+                count,
+                False,
+                metrics,
+            )
+        finally:
+            self._slots.release()
+
+    async def async_write_register(
+        self,
+        slave_id: int,
+        address: int,
+        value: int,
+        metrics: PollMetrics | None = None,
+    ) -> Any:
+        """Write a single register of one slave."""
+        return await self._async_write(slave_id, address, [value], True, metrics)
+
+    async def async_write_registers(
+        self,
+        slave_id: int,
+        address: int,
+        values: list[int],
+        metrics: PollMetrics | None = None,
+    ) -> Any:
+        """Write multiple registers of one slave."""
+        return await self._async_write(slave_id, address, values, False, metrics)
+
+    async def _async_write(
+        self,
+        slave_id: int,
+        address: int,
+        values: list[int],
+        single: bool,
+        metrics: PollMetrics | None,
+    ) -> Any:
+        """Queue a write ahead of reads, coalescing it with a queued one."""
+        key = (slave_id, address, len(values))
+        if (queued := self._queued_writes.get(key)) is not None:
+            # Not sent yet, so only the latest value has to reach the device
+            queued.values = values
+            return await asyncio.shield(queued.future)
+
+        queued = self._queued_writes[key] = _QueuedWrite(values)
+        try:
+            await self._slots.acquire(PRIORITY_WRITE)
+        except BaseException as err:
+            self._queued_writes.pop(key, None)
+            if not queued.future.done():
+                queued.future.set_exception(ConnectionError(f"Write cancelled: {err!r}"))
+                # Mark retrieved for callers that never coalesced
+                queued.future.exception()
+            raise
+
+        # From here on the write is in flight and can no longer be updated
+        self._queued_writes.pop(key, None)
+        try:
+            if self._client is None:
+                raise ConnectionError(f"Not connected to {self.key}")
+            if single:
+                request = partial(
+                    self._client.write_register,
+                    address=address,
+                    value=queued.values[0],
+                    device_id=slave_id
+                )
+            else:
+                request = partial(
+                    self._client.write_registers,
+                    address=address,
+                    values=queued.values,
+                    device_id=slave_id
+                )
+            result = await self._async_send(
+                request, len(queued.values), True, metrics
+            )
+        except Exception as err:
+            queued.future.set_exception(err)
+            queued.future.exception()
+            raise
+        finally:
+            self._slots.release()
+
+        queued.future.set_result(result)
+        return result
+
+    async def async_modify_register(
+        self,
+        slave_id: int,
+        address: int,
+        and_mask: int,
+        or_mask: int,
+        shadow: Callable[[], int | None] | None = None,
+        written: Callable[[int | None], None] | None = None,
+        metrics: PollMetrics | None = None,
+    ) -> int | None:
+        """Change bits of one register as a single scheduled operation.
+
+        Slaves implementing mask write (function 22) apply the masks
+        themselves. Otherwise the register is read, unless ``shadow``
+        returns its current value, and written back while holding one slot,
+        so no other write from this connection lands in between. Both
+        ``shadow`` and ``written`` are called while the slot is held, the
+        latter with the written value or None when the slave applied the
+        masks. Returns the same value.
+        """
+        await self._slots.acquire(PRIORITY_WRITE)
+        try:
+            if self._client is None:
+                raise ConnectionError(f"Not connected to {self.key}")
+
+            supported = self._mask_write.get(slave_id)
+            if supported is not False:
+                try:
+                    result = await self._async_send(
+                        partial(
+                            self._client.mask_write_register,
+                            address=address,
+                            and_mask=and_mask,
+                            or_mask=or_mask,
+                            device_id=slave_id
+                        ),
+                        1,
+                        True,
+                        metrics,
+                    )
+                except TIMEOUT_ERRORS as err:
+                    if supported:
+                        raise
+                    # Some slaves drop unknown functions instead of
+                    # rejecting them, so never wait for this one again
+                    _LOGGER.debug(
+                        f"Mask write to slave {slave_id} on {self.key} got no "
+                        f"answer ({err}), using read-modify-write"
+                    )
+                    self._mask_write[slave_id] = False
+                else:
+                    if not result.isError():
+                        self._mask_write[slave_id] = True
+                        if written is not None:
+                            written(None)
+                        return None
+                    if supported or getattr(result, "exception_code", None) != ILLEGAL_FUNCTION:
+                        raise WriteRejectedError(f"Mask write rejected: {result}")
+                    _LOGGER.debug(
+                        f"Slave {slave_id} on {self.key} does not support mask "
+                        f"write, using read-modify-write"
+                    )
+                    self._mask_write[slave_id] = False
+
+            current = None if shadow is None else shadow()
+            if current is None:
+                result = await self._async_send(
+                    partial(
+                        self._client.read_holding_registers,
+                        address=address,
+                        count=1,
+                        device_id=slave_id
+                    ),
+                    1,
+                    False,
+                    metrics,
+                )
+                if result.isError():
+                    raise WriteRejectedError(f"Read before write failed: {result}")
+                current = result.registers[0]
+
+            value = (current & and_mask) | (or_mask & ~and_mask & 0xFFFF)
+            result = await self._async_send(
+                partial(
+                    self._client.write_register,
+                    address=address,
+                    value=value,
+                    device_id=slave_id
+                ),
+                1,
+                True,
+                metrics,
+            )
+            if result.isError():
+                raise WriteRejectedError(f"Write rejected: {result}")
+            if written is not None:
+                written(value)
+            return value
+        finally:
+            self._slots.release()
+
+
+class CircuitOpenError(ConnectionError):
+    """Error to indicate reconnect attempts are backed off."""
+
+
+class WriteRejectedError(Exception):
+    """Error to indicate the device rejected a write."""
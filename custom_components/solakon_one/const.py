@@ -8,84 +8,195 @@ DEFAULT_SLAVE_ID: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 30
 SCAN_INTERVAL: Final = 30
 
+# Reconnect backoff bounds in seconds
+RECONNECT_MIN_DELAY: Final = 5
+RECONNECT_MAX_DELAY: Final = 300
+
+# Transports: Modbus TCP, Modbus RTU frames tunnelled over a TCP socket and
+# Modbus RTU on a local RS485 serial port
+CONF_TRANSPORT: Final = "transport"
+TRANSPORT_TCP: Final = "tcp"
+TRANSPORT_RTU_OVER_TCP: Final = "rtu_over_tcp"
+TRANSPORT_SERIAL: Final = "serial"
+
+# Serial line settings of the RTU transport
+CONF_SERIAL_PORT: Final = "serial_port"
+CONF_BAUDRATE: Final = "baudrate"
+CONF_PARITY: Final = "parity"
+CONF_STOPBITS: Final = "stopbits"
+DEFAULT_BAUDRATE: Final = 9600
+DEFAULT_PARITY: Final = "N"
+DEFAULT_STOPBITS: Final = 1
+BAUDRATES: Final = (1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200)
+
+# Modbus TCP transactions kept in flight, 1 disables pipelining
+CONF_PIPELINE_DEPTH: Final = "pipeline_depth"
+DEFAULT_PIPELINE_DEPTH: Final = 1
+MAX_PIPELINE_DEPTH: Final = 8
+
+# Load the entry without waiting for the device, connecting and the first
+# poll then run in the background
+CONF_BACKGROUND_SETUP: Final = "background_setup"
+DEFAULT_BACKGROUND_SETUP: Final = False
+
+# Zero-export control loop options
+CONF_CONTROL_METER: Final = "control_meter_entity"
+CONF_CONTROL_TARGET: Final = "control_target"
+CONF_CONTROL_DEADBAND: Final = "control_deadband"
+CONF_CONTROL_HYSTERESIS: Final = "control_hysteresis"
+CONF_CONTROL_RAMP_RATE: Final = "control_ramp_rate"
+CONF_CONTROL_INTERVAL: Final = "control_interval"
+CONTROL_REGISTER: Final = "import_power_limit"
+DEFAULT_CONTROL_TARGET: Final = 0
+DEFAULT_CONTROL_DEADBAND: Final = 50
+DEFAULT_CONTROL_HYSTERESIS: Final = 50
+DEFAULT_CONTROL_RAMP_RATE: Final = 1000
+DEFAULT_CONTROL_INTERVAL: Final = 2
+
+# Seconds a shadowed register value may be reused for a read-modify-write
+# instead of reading the register again
+SHADOW_MAX_AGE: Final = 5
+
+# Last polled values persisted so entities start from them after a restart,
+# written at most every SNAPSHOT_SAVE_DELAY seconds and when HA stops
+SNAPSHOT_STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 300
+# Snapshots older than this many seconds are not restored
+SNAPSHOT_MAX_AGE: Final = 86400
+
+# Config entry key caching the device identity read from the inverter
+CONF_DEVICE_INFO: Final = "device_info"
+
+# Modbus allows at most 125 holding registers per read request
+MAX_READ_REGISTERS: Final = 125
+# Unused registers tolerated between two values before a new block is started
+CONF_MAX_READ_GAP: Final = "max_read_gap"
+DEFAULT_MAX_READ_GAP: Final = 10
+# Seconds a finished poll waits for the other polls on its gateway before
+# its buffers are decoded without them
+DECODE_BATCH_MAX_WAIT: Final = 1
+
+# Poll classes controlling how often a register is re-read
+POLL_STATIC: Final = "static"  # read once
+POLL_SLOW: Final = "slow"  # read every SLOW_SCAN_INTERVAL
+POLL_NORMAL: Final = "normal"  # read every scan_interval
+POLL_FAST: Final = "fast"  # read every fast_scan_interval
+
+CONF_FAST_SCAN_INTERVAL: Final = "fast_scan_interval"
+DEFAULT_FAST_SCAN_INTERVAL: Final = 10
+SLOW_SCAN_INTERVAL: Final = 300
+
+# Adaptive polling: normal and fast intervals stretch to idle_scan_interval
+# while there is no PV power and the battery is idle, and the fast interval
+# drops to min_scan_interval for TRANSIENT_HOLD seconds after a power step
+CONF_IDLE_SCAN_INTERVAL: Final = "idle_scan_interval"
+CONF_MIN_SCAN_INTERVAL: Final = "min_scan_interval"
+DEFAULT_IDLE_SCAN_INTERVAL: Final = 120
+DEFAULT_MIN_SCAN_INTERVAL: Final = 2
+IDLE_BATTERY_POWER: Final = 20  # W
+TRANSIENT_POWER_STEP: Final = 300  # W between two fast polls
+TRANSIENT_HOLD: Final = 60
+
+# High-rate sampling: SAMPLED_KEYS are read every sample_interval seconds
+# into ring buffers holding SAMPLE_BUFFER_WINDOWS scan intervals of samples
+# and published once per scan_interval as their mean, with min, max and last
+# under the key plus SAMPLE_STATS_SUFFIX (0 disables sampling)
+CONF_SAMPLE_INTERVAL: Final = "sample_interval"
+DEFAULT_SAMPLE_INTERVAL: Final = 0
+MIN_SAMPLE_INTERVAL: Final = 0.5
+SAMPLE_BUFFER_WINDOWS: Final = 2
+SAMPLE_STATS_SUFFIX: Final = "_stats"
+SAMPLED_KEYS: Final = ("total_pv_power", "active_power", "battery_combined_power")
+
+# Adaptive polling modes
+POLL_MODE_IDLE: Final = "idle"
+POLL_MODE_NORMAL: Final = "normal"
+POLL_MODE_TRANSIENT: Final = "transient"
+
 # Register definitions
 REGISTERS = {
     # Model Information (Table 3-1)
-    "model_name": {"address": 30000, "count": 16, "type": "string"},
-    "serial_number": {"address": 30016, "count": 16, "type": "string"},
-    "mfg_id": {"address": 30032, "count": 16, "type": "string"},
+    "model_name": {"address": 30000, "count": 16, "type": "string", "poll": POLL_STATIC},
+    "serial_number": {"address": 30016, "count": 16, "type": "string", "poll": POLL_STATIC},
+    "mfg_id": {"address": 30032, "count": 16, "type": "string", "poll": POLL_STATIC},
     
     # Version Information (Table 3-2)
-    "master_version": {"address": 36001, "count": 1, "type": "u16"},
-    "slave_version": {"address": 36002, "count": 1, "type": "u16"},
-    "manager_version": {"address": 36003, "count": 1, "type": "u16"},
+    "master_version": {"address": 36001, "count": 1, "type": "u16", "poll": POLL_STATIC},
+    "slave_version": {"address": 36002, "count": 1, "type": "u16", "poll": POLL_STATIC},
+    "manager_version": {"address": 36003, "count": 1, "type": "u16", "poll": POLL_STATIC},
     
     # Protocol & Device Info (Table 3-5)
-    "protocol_version": {"address": 39000, "count": 2, "type": "u32"},
-    "rated_power": {"address": 39053, "count": 2, "type": "i32", "scale": 1000, "unit": "kW"},
-    "max_active_power": {"address": 39055, "count": 2, "type": "i32", "scale": 1000, "unit": "kW"},
+    "protocol_version": {"address": 39000, "count": 2, "type": "u32", "poll": POLL_STATIC},
+    "rated_power": {"address": 39053, "count": 2, "type": "i32", "scale": 1000, "unit": "kW", "poll": POLL_STATIC},
+    "max_active_power": {"address": 39055, "count": 2, "type": "i32", "scale": 1000, "unit": "kW", "poll": POLL_STATIC},
     
     # Status
-    "status_1": {"address": 39063, "count": 1, "type": "bitfield16"},
-    "alarm_1": {"address": 39067, "count": 1, "type": "bitfield16"},
-    "alarm_2": {"address": 39068, "count": 1, "type": "bitfield16"},
-    "alarm_3": {"address": 39069, "count": 1, "type": "bitfield16"},
+    "status_1": {"address": 39063, "count": 1, "type": "bitfield16", "poll": POLL_NORMAL},
+    "alarm_1": {"address": 39067, "count": 1, "type": "bitfield16", "poll": POLL_NORMAL},
+    "alarm_2": {"address": 39068, "count": 1, "type": "bitfield16", "poll": POLL_NORMAL},
+    "alarm_3": {"address": 39069, "count": 1, "type": "bitfield16", "poll": POLL_NORMAL},
     
     # PV Input
-    "pv1_voltage": {"address": 39070, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "pv1_current": {"address": 39071, "count": 1, "type": "i16", "scale": 100, "unit": "A"},
-    "pv2_voltage": {"address": 39072, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "pv2_current": {"address": 39073, "count": 1, "type": "i16", "scale": 100, "unit": "A"},
-    "pv3_voltage": {"address": 39074, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "pv3_current": {"address": 39075, "count": 1, "type": "i16", "scale": 100, "unit": "A"},
-    "pv4_voltage": {"address": 39076, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "pv4_current": {"address": 39077, "count": 1, "type": "i16", "scale": 100, "unit": "A"},
-    "total_pv_power": {"address": 39118, "count": 2, "type": "i32", "scale": 1000, "unit": "kW"},
+    "pv1_voltage": {"address": 39070, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "pv1_current": {"address": 39071, "count": 1, "type": "i16", "scale": 100, "unit": "A", "poll": POLL_NORMAL},
+    "pv2_voltage": {"address": 39072, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "pv2_current": {"address": 39073, "count": 1, "type": "i16", "scale": 100, "unit": "A", "poll": POLL_NORMAL},
+    "pv3_voltage": {"address": 39074, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "pv3_current": {"address": 39075, "count": 1, "type": "i16", "scale": 100, "unit": "A", "poll": POLL_NORMAL},
+    "pv4_voltage": {"address": 39076, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "pv4_current": {"address": 39077, "count": 1, "type": "i16", "scale": 100, "unit": "A", "poll": POLL_NORMAL},
+    "total_pv_power": {"address": 39118, "count": 2, "type": "i32", "scale": 1000, "unit": "kW", "poll": POLL_FAST},
     #selfmade additions for pv stats
-    "pv_total": {"address": 39601, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "pv_daily": {"address": 39603, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
+    "pv_total": {"address": 39601, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_SLOW},
+    "pv_daily": {"address": 39603, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_NORMAL},
     
     # Grid Information
-    "grid_r_voltage": {"address": 39123, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "grid_s_voltage": {"address": 39124, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "grid_t_voltage": {"address": 39125, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "inverter_r_current": {"address": 39126, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
-    "inverter_s_current": {"address": 39128, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
-    "inverter_t_current": {"address": 39130, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
-    "active_power": {"address": 39134, "count": 2, "type": "i32", "scale": 1000, "unit": "kW"},
-    "reactive_power": {"address": 39136, "count": 2, "type": "i32", "scale": 1000, "unit": "kVar"},
-    "power_factor": {"address": 39138, "count": 1, "type": "i16", "scale": 1000},
-    "grid_frequency": {"address": 39139, "count": 1, "type": "i16", "scale": 100, "unit": "Hz"},
+    "grid_r_voltage": {"address": 39123, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "grid_s_voltage": {"address": 39124, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "grid_t_voltage": {"address": 39125, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "inverter_r_current": {"address": 39126, "count": 2, "type": "i32", "scale": 1000, "unit": "A", "poll": POLL_NORMAL},
+    "inverter_s_current": {"address": 39128, "count": 2, "type": "i32", "scale": 1000, "unit": "A", "poll": POLL_NORMAL},
+    "inverter_t_current": {"address": 39130, "count": 2, "type": "i32", "scale": 1000, "unit": "A", "poll": POLL_NORMAL},
+    "active_power": {"address": 39134, "count": 2, "type": "i32", "scale": 1000, "unit": "kW", "poll": POLL_FAST},
+    "reactive_power": {"address": 39136, "count": 2, "type": "i32", "scale": 1000, "unit": "kVar", "poll": POLL_FAST},
+    "power_factor": {"address": 39138, "count": 1, "type": "i16", "scale": 1000, "poll": POLL_NORMAL},
+    "grid_frequency": {"address": 39139, "count": 1, "type": "i16", "scale": 100, "unit": "Hz", "poll": POLL_NORMAL},
     
     # Temperature
-    "internal_temp": {"address": 39141, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
+    "internal_temp": {"address": 39141, "count": 1, "type": "i16", "scale": 10, "unit": "°C", "poll": POLL_NORMAL},
     
     # Energy Statistics
-    "cumulative_generation": {"address": 39149, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "daily_generation": {"address": 39151, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
+    "cumulative_generation": {"address": 39149, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_SLOW},
+    "daily_generation": {"address": 39151, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_NORMAL},
     # selfmade additions for energy stats
-    "output_total": {"address": 39621, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "output_daily": {"address": 39623, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
+    "output_total": {"address": 39621, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_SLOW},
+    "output_daily": {"address": 39623, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_NORMAL},
     
     # Battery Information
-    "battery1_voltage": {"address": 39227, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
-    "battery1_current": {"address": 39228, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
-    "battery1_power": {"address": 39230, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
-    "battery_combined_power": {"address": 39237, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
+    "battery1_voltage": {"address": 39227, "count": 1, "type": "i16", "scale": 10, "unit": "V", "poll": POLL_NORMAL},
+    "battery1_current": {"address": 39228, "count": 2, "type": "i32", "scale": 1000, "unit": "A", "poll": POLL_NORMAL},
+    "battery1_power": {"address": 39230, "count": 2, "type": "i32", "scale": 1, "unit": "W", "poll": POLL_FAST},
+    "battery_combined_power": {"address": 39237, "count": 2, "type": "i32", "scale": 1, "unit": "W", "poll": POLL_FAST},
     # selfmade additions for battery stats
-    "battery_charging_total": {"address": 39605, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "battery_charging_daily": {"address": 39607, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "battery_discharging_total": {"address": 39609, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "battery_discharging_daily": {"address": 39611, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "battery_state_of_charge": {"address": 39424, "count": 1, "type": "i16", "scale": 1, "unit": "%"},
+    "battery_charging_total": {"address": 39605, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_SLOW},
+    "battery_charging_daily": {"address": 39607, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_NORMAL},
+    "battery_discharging_total": {"address": 39609, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_SLOW},
+    "battery_discharging_daily": {"address": 39611, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "poll": POLL_NORMAL},
+    "battery_state_of_charge": {"address": 39424, "count": 1, "type": "i16", "scale": 1, "unit": "%", "poll": POLL_NORMAL},
 
     # Remote control and limits
-    "remote_control_flags": {"address": 46001, "count": 1, "type": "u16"},
-    "import_power_limit": {"address": 46501, "count": 2, "type": "i32", "unit": "W"},
+    "remote_control_flags": {"address": 46001, "count": 1, "type": "u16", "poll": POLL_NORMAL},
+    "import_power_limit": {"address": 46501, "count": 2, "type": "i32", "unit": "W", "poll": POLL_NORMAL},
 
 }
 
 # Sensor definitions for Home Assistant
+# Optional publish throttling per sensor:
+#   "deadband"          smallest change published, in the sensor unit
+#   "deadband_percent"  smallest change published, relative to the shown value
+#   "min_interval"      seconds to wait after a publish before the next one
+#   "max_interval"      seconds after which the value is published even if
+#                       it did not change meaningfully
 SENSOR_DEFINITIONS = {
     # Power sensors
     "total_pv_power": {
@@ -94,6 +205,8 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "kW",
         "icon": "mdi:solar-power",
+        "deadband": 0.01,
+        "max_interval": 300,
     },
     "active_power": {
         "name": "Active Power",
@@ -101,6 +214,8 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "kW",
         "icon": "mdi:flash",
+        "deadband": 0.01,
+        "max_interval": 300,
     },
     "reactive_power": {
         "name": "Reactive Power",
@@ -108,6 +223,8 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "kVar",
         "icon": "mdi:flash-outline",
+        "deadband": 0.01,
+        "max_interval": 300,
     },
     "battery_combined_power": {
         "name": "Battery Power",
@@ -115,6 +232,8 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "W",
         "icon": "mdi:battery-charging",
+        "deadband": 10,
+        "max_interval": 300,
     },
     
     # Voltage sensors
@@ -124,6 +243,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:flash",
+        "deadband_percent": 1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv2_voltage": {
         "name": "PV2 Voltage",
@@ -131,6 +253,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:flash",
+        "deadband_percent": 1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv3_voltage": {
         "name": "PV3 Voltage",
@@ -138,6 +263,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:flash",
+        "deadband_percent": 1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv4_voltage": {
         "name": "PV4 Voltage",
@@ -145,6 +273,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:flash",
+        "deadband_percent": 1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "grid_r_voltage": {
         "name": "Grid R Voltage",
@@ -152,6 +283,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:sine-wave",
+        "deadband": 1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "battery1_voltage": {
         "name": "Battery Voltage",
@@ -159,6 +293,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "V",
         "icon": "mdi:battery",
+        "deadband": 0.1,
+        "min_interval": 10,
+        "max_interval": 300,
     },
 
     # Current sensors
@@ -168,6 +305,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "A",
         "icon": "mdi:current-dc",
+        "deadband_percent": 2,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv2_current": {
         "name": "PV2 Current",
@@ -175,6 +315,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "A",
         "icon": "mdi:current-dc",
+        "deadband_percent": 2,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv3_current": {
         "name": "PV3 Current",
@@ -182,6 +325,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "A",
         "icon": "mdi:current-dc",
+        "deadband_percent": 2,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "pv4_current": {
         "name": "PV4 Current",
@@ -189,6 +335,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "A",
         "icon": "mdi:current-dc",
+        "deadband_percent": 2,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "battery1_current": {
         "name": "Battery Current",
@@ -230,6 +379,8 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "°C",
         "icon": "mdi:thermometer",
+        "deadband": 0.5,
+        "max_interval": 600,
     },
     
     # Other sensors
@@ -238,6 +389,9 @@ SENSOR_DEFINITIONS = {
         "device_class": "power_factor",
         "state_class": "measurement",
         "icon": "mdi:angle-acute",
+        "deadband": 0.01,
+        "min_interval": 10,
+        "max_interval": 300,
     },
     "grid_frequency": {
         "name": "Grid Frequency",
@@ -245,6 +399,9 @@ SENSOR_DEFINITIONS = {
         "state_class": "measurement",
         "unit": "Hz",
         "icon": "mdi:sine-wave",
+        "deadband": 0.02,
+        "min_interval": 10,
+        "max_interval": 300,
     },
 
     # Selfmade additions
@@ -328,3 +485,119 @@ SWITCH_DEFINITIONS = {
         "icon": "mdi:remote",
     },
 }
+
+# Names of the bits of the bitfield registers, indexed by bit number.
+# Alarm bits are not documented individually and are reported by number.
+BITFIELD_BITS = {
+    "status_1": ("standby", "operation", "fault") + tuple(
+        f"bit_{bit}" for bit in range(3, 16)
+    ),
+    **{
+        key: tuple(f"bit_{bit}" for bit in range(16))
+        for key in ("alarm_1", "alarm_2", "alarm_3")
+    },
+}
+
+# Binary sensor definitions, entities with a "bit" follow that bit of the
+# register, the others are on while any bit of the register is set
+BINARY_SENSOR_DEFINITIONS = {
+    "standby": {
+        "name": "Standby",
+        "register": "status_1",
+        "bit": 0,
+        "icon": "mdi:sleep",
+    },
+    "operating": {
+        "name": "Operating",
+        "register": "status_1",
+        "bit": 1,
+        "device_class": "running",
+    },
+    "fault": {
+        "name": "Fault",
+        "register": "status_1",
+        "bit": 2,
+        "device_class": "problem",
+    },
+    "alarm_1": {
+        "name": "Alarm 1",
+        "register": "alarm_1",
+        "device_class": "problem",
+    },
+    "alarm_2": {
+        "name": "Alarm 2",
+        "register": "alarm_2",
+        "device_class": "problem",
+    },
+    "alarm_3": {
+        "name": "Alarm 3",
+        "register": "alarm_3",
+        "device_class": "problem",
+    },
+}
+
+# Diagnostic sensors reporting hub metrics, keyed by metric name.
+# "factor" converts the metric into the sensor unit.
+DIAGNOSTIC_SENSOR_DEFINITIONS = {
+    "last_poll_duration": {
+        "name": "Poll Duration",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "unit": "s",
+        "precision": 3,
+        "icon": "mdi:timer-outline",
+    },
+    "rtt_mean": {
+        "name": "Request Round Trip",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "unit": "ms",
+        "factor": 1000,
+        "precision": 1,
+        "icon": "mdi:swap-horizontal",
+    },
+    "rtt_p95": {
+        "name": "Request Round Trip 95th Percentile",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "unit": "ms",
+        "factor": 1000,
+        "precision": 1,
+        "icon": "mdi:swap-horizontal",
+    },
+    "requests": {
+        "name": "Modbus Requests",
+        "state_class": "total_increasing",
+        "icon": "mdi:counter",
+        "enabled_default": False,
+    },
+    "writes": {
+        "name": "Modbus Writes",
+        "state_class": "total_increasing",
+        "icon": "mdi:pencil-outline",
+        "enabled_default": False,
+    },
+    "errors": {
+        "name": "Modbus Errors",
+        "state_class": "total_increasing",
+        "icon": "mdi:alert-circle-outline",
+    },
+    "timeouts": {
+        "name": "Modbus Timeouts",
+        "state_class": "total_increasing",
+        "icon": "mdi:timer-alert-outline",
+    },
+    "reconnects": {
+        "name": "Reconnects",
+        "state_class": "total_increasing",
+        "icon": "mdi:connection",
+    },
+    "bytes_received": {
+        "name": "Bytes Received",
+        "device_class": "data_size",
+        "state_class": "total_increasing",
+        "unit": "B",
+        "icon": "mdi:download-network-outline",
+        "enabled_default": False,
+    },
+}
@@ -0,0 +1,181 @@
+"""Zero-export control loop for Solakon ONE."""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+
+from .const import (
+    CONTROL_REGISTER,
+    DEFAULT_CONTROL_DEADBAND,
+    DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_CONTROL_RAMP_RATE,
+    DEFAULT_CONTROL_TARGET,
+    NUMBER_DEFINITIONS,
+)
+
+if TYPE_CHECKING:
+    from . import SolakonDataCoordinator
+    from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ZeroExportController:
+    """Drive ``import_power_limit`` from a grid meter to hold a target exchange.
+
+    The meter reports grid power in W (kW is converted), positive for import.
+    Every period the setpoint is moved by the error between meter and target,
+    limited to ``ramp_rate`` W/s. Once the error falls inside the deadband the
+    loop holds still until it leaves the deadband plus the hysteresis margin.
+    Only changed setpoints are written, and only the controlled register is
+    read back afterwards.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: SolakonModbusHub,
+        coordinator: SolakonDataCoordinator,
+        meter_entity_id: str,
+        target: float = DEFAULT_CONTROL_TARGET,
+        deadband: float = DEFAULT_CONTROL_DEADBAND,
+        hysteresis: float = DEFAULT_CONTROL_HYSTERESIS,
+        ramp_rate: float = DEFAULT_CONTROL_RAMP_RATE,
+        interval: float = DEFAULT_CONTROL_INTERVAL,
+    ) -> None:
+        """Initialize the controller."""
+        self._hass = hass
+        self._hub = hub
+        self._coordinator = coordinator
+        self._meter_entity_id = meter_entity_id
+        self.target = target
+        self.deadband = deadband
+        self.hysteresis = hysteresis
+        self.ramp_rate = ramp_rate
+        self.interval = interval
+
+        limits = NUMBER_DEFINITIONS[CONTROL_REGISTER]
+        self._min = limits.get("min", 0)
+        self._max = limits.get("max")
+        self._step = limits.get("step") or 1
+
+        self._meter: float | None = None
+        # Each meter reading is acted on once, so a slow meter cannot make
+        # the loop integrate the same error several times
+        self._meter_fresh = False
+        self._setpoint: float | None = None
+        self._adjusting = True
+        self._running = False
+        self._unsubscribers: list[Any] = []
+
+    @property
+    def setpoint(self) -> float | None:
+        """Return the last setpoint confirmed by the device."""
+        return self._setpoint
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the meter."""
+        self._meter = self._read_meter(self._hass.states.get(self._meter_entity_id))
+        self._meter_fresh = self._meter is not None
+        self._unsubscribers = [
+            async_track_state_change_event(
+                self._hass, [self._meter_entity_id], self._async_meter_changed
+            ),
+            async_track_time_interval(
+                self._hass, self._async_tick, timedelta(seconds=self.interval)
+            ),
+        ]
+        _LOGGER.info(
+            f"Zero-export control following {self._meter_entity_id} "
+            f"every {self.interval}s"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the control loop."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+
+    @callback
+    def _async_meter_changed(self, event: Event) -> None:
+        """Remember the latest meter reading."""
+        self._meter = self._read_meter(event.data.get("new_state"))
+        self._meter_fresh = self._meter is not None
+
+    @staticmethod
+    def _read_meter(state: Any) -> float | None:
+        """Return the grid power of a meter state in W."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        if state.attributes.get("unit_of_measurement") == "kW":
+            value *= 1000
+        return value
+
+    async def _async_tick(self, _now: Any = None) -> None:
+        """Run one control period."""
+        if self._running:
+            # The previous period is still waiting for the device
+            return
+        self._running = True
+        try:
+            await self._async_step()
+        finally:
+            self._running = False
+
+    async def _async_step(self) -> None:
+        """Compute and apply the next setpoint."""
+        if not self._meter_fresh:
+            return
+        self._meter_fresh = False
+
+        if self._coordinator.stale:
+            # Never steer from a value restored from the snapshot
+            return
+
+        # Follow the device value so manual changes are picked up too
+        current = (self._coordinator.data or {}).get(CONTROL_REGISTER)
+        if current is None:
+            return
+        self._setpoint = float(current)
+
+        error = self._meter - self.target
+        if self._adjusting:
+            if abs(error) <= self.deadband:
+                self._adjusting = False
+                return
+        elif abs(error) > self.deadband + self.hysteresis:
+            self._adjusting = True
+        else:
+            return
+
+        max_change = self.ramp_rate * self.interval
+        change = max(-max_change, min(max_change, error))
+        setpoint = round((self._setpoint + change) / self._step) * self._step
+        setpoint = max(self._min, setpoint)
+        if self._max is not None:
+            setpoint = min(self._max, setpoint)
+
+        if setpoint == self._setpoint:
+            return
+
+        data = await self._hub.async_write_verified(CONTROL_REGISTER, setpoint)
+        if data is None:
+            _LOGGER.debug(f"Zero-export control failed to write {setpoint}")
+            return
+
+        self._setpoint = data.get(CONTROL_REGISTER, setpoint)
+        self._coordinator.async_merge_data(data)
@@ -0,0 +1,39 @@
+"""Diagnostics support for Solakon ONE."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST, "serial_number", "gateway"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    hub = entry_data["hub"]
+    coordinator = entry_data["coordinator"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": async_redact_data(hub.connection_health, TO_REDACT),
+        "polling": {
+            "mode": hub.poll_mode,
+            "update_interval": hub.update_interval,
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "polled_at": coordinator.polled_at,
+        },
+        "metrics": hub.metrics_data,
+        "data": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
@@ -0,0 +1,66 @@
+"""Base entity for Solakon ONE integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+
+def build_device_info(
+    config_entry: ConfigEntry, device_info: dict[str, Any]
+) -> DeviceInfo:
+    """Build the device registry entry shared by all entities of a hub."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=config_entry.data.get("name", "Solakon ONE"),
+        manufacturer=device_info.get("manufacturer", "Solakon"),
+        model=device_info.get("model", "One"),
+        sw_version=device_info.get("sw_version"),
+        serial_number=device_info.get("serial_number"),
+    )
+
+
+class SolakonEntity(CoordinatorEntity):
+    """Common base of Solakon ONE entities."""
+
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        description: EntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_device_info = device_info
+        self._last_status = self._status()
+
+    def _status(self) -> tuple[bool, bool]:
+        """Return whether the coordinator data is available and stale."""
+        return self.coordinator.last_update_success, self.coordinator.stale
+
+    def _status_changed(self) -> bool:
+        """Return whether availability or staleness changed since last called."""
+        status = self._status()
+        changed = status != self._last_status
+        self._last_status = status
+        return changed
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes, flagging values restored from the snapshot."""
+        attributes = getattr(self, "_attr_extra_state_attributes", None)
+        if not self.coordinator.stale:
+            return attributes
+        return {
+            **(attributes or {}),
+            "stale": True,
+            "polled_at": self.coordinator.polled_at.isoformat(),
+        }
@@ -0,0 +1,133 @@
+"""Request and poll metrics for Solakon ONE."""
+from __future__ import annotations
+
+import bisect
+from typing import Any
+
+# Upper bounds in seconds of the round-trip histogram buckets, the last
+# bucket counts everything slower
+RTT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Bytes of a read request frame and of a read response frame without its
+# register payload, with an MBAP header for TCP and a CRC for RTU framing
+_READ_REQUEST_BYTES = 12
+_READ_RESPONSE_BYTES = 9
+_RTU_READ_REQUEST_BYTES = 8
+_RTU_READ_RESPONSE_BYTES = 5
+# Bytes of a write response frame, which single register writes also send
+_WRITE_RESPONSE_BYTES = 12
+_RTU_WRITE_RESPONSE_BYTES = 8
+
+
+class PollMetrics:
+    """Counters and histograms describing the traffic of one hub."""
+
+    def __init__(self, rtu: bool = False) -> None:
+        """Initialize the metrics."""
+        self._request_bytes = _RTU_READ_REQUEST_BYTES if rtu else _READ_REQUEST_BYTES
+        self._response_bytes = (
+            _RTU_READ_RESPONSE_BYTES if rtu else _READ_RESPONSE_BYTES
+        )
+        self._write_bytes = _RTU_WRITE_RESPONSE_BYTES if rtu else _WRITE_RESPONSE_BYTES
+        self.requests = 0
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rtt_histogram = [0] * (len(RTT_BUCKETS) + 1)
+        self.rtt_total = 0.0
+        self.rtt_max = 0.0
+        self.polls = 0
+        self.poll_requests = 0
+        self.last_poll_duration: float | None = None
+        self.poll_duration_total = 0.0
+        self.poll_duration_max = 0.0
+
+    def record_read(self, rtt: float, count: int, answered: bool) -> None:
+        """Record one read request and its round-trip time."""
+        self.reads += 1
+        self.bytes_sent += self._request_bytes
+        if answered:
+            self.bytes_received += self._response_bytes + count * 2
+        self._record_rtt(rtt)
+
+    def record_write(self, rtt: float, count: int, answered: bool) -> None:
+        """Record one write request and its round-trip time."""
+        self.writes += 1
+        # Writing several registers adds a byte count and the values
+        self.bytes_sent += self._write_bytes + (count * 2 + 1 if count > 1 else 0)
+        if answered:
+            self.bytes_received += self._write_bytes
+        self._record_rtt(rtt)
+
+    def _record_rtt(self, rtt: float) -> None:
+        """Count a request and add its round-trip time to the histogram."""
+        self.requests += 1
+        self.rtt_histogram[bisect.bisect_left(RTT_BUCKETS, rtt)] += 1
+        self.rtt_total += rtt
+        self.rtt_max = max(self.rtt_max, rtt)
+
+    def record_error(self, timeout: bool = False) -> None:
+        """Record a request that failed or was rejected."""
+        self.errors += 1
+        if timeout:
+            self.timeouts += 1
+
+    def record_poll(self, duration: float, requests: int) -> None:
+        """Record the duration and request count of one poll."""
+        self.polls += 1
+        self.poll_requests += requests
+        self.last_poll_duration = duration
+        self.poll_duration_total += duration
+        self.poll_duration_max = max(self.poll_duration_max, duration)
+
+    @property
+    def rtt_mean(self) -> float | None:
+        """Return the mean round-trip time in seconds."""
+        if not self.requests:
+            return None
+        return self.rtt_total / self.requests
+
+    def rtt_percentile(self, percentile: float) -> float | None:
+        """Return the upper bucket bound holding the given percentile."""
+        if not self.requests:
+            return None
+        rank = self.requests * percentile / 100
+        seen = 0
+        for bound, count in zip((*RTT_BUCKETS, self.rtt_max), self.rtt_histogram):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.rtt_max)
+        return self.rtt_max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as plain values."""
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "rtt_mean": self.rtt_mean,
+            "rtt_p95": self.rtt_percentile(95),
+            "rtt_max": self.rtt_max,
+            "rtt_histogram": {
+                **{
+                    f"<={bound}s": count
+                    for bound, count in zip(RTT_BUCKETS, self.rtt_histogram)
+                },
+                f">{RTT_BUCKETS[-1]}s": self.rtt_histogram[-1],
+            },
+            "polls": self.polls,
+            "requests_per_poll": (
+                self.poll_requests / self.polls if self.polls else None
+            ),
+            "last_poll_duration": self.last_poll_duration,
+            "poll_duration_mean": (
+                self.poll_duration_total / self.polls if self.polls else None
+            ),
+            "poll_duration_max": self.poll_duration_max,
+        }
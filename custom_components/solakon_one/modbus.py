@@ -3,15 +3,151 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import time
+from collections.abc import Mapping
 from typing import Any
 
-from pymodbus.client import AsyncModbusTcpClient
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import REGISTERS
+from .const import (
+    CONF_BAUDRATE,
+    CONF_PARITY,
+    CONF_SERIAL_PORT,
+    CONF_STOPBITS,
+    CONF_TRANSPORT,
+    DEFAULT_BAUDRATE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PARITY,
+    DEFAULT_PIPELINE_DEPTH,
+    DEFAULT_STOPBITS,
+    DOMAIN,
+    IDLE_BATTERY_POWER,
+    MIN_SAMPLE_INTERVAL,
+    NUMBER_DEFINITIONS,
+    POLL_FAST,
+    POLL_MODE_IDLE,
+    POLL_MODE_NORMAL,
+    POLL_MODE_TRANSIENT,
+    POLL_NORMAL,
+    POLL_SLOW,
+    POLL_STATIC,
+    REGISTERS,
+    SAMPLE_BUFFER_WINDOWS,
+    SAMPLE_STATS_SUFFIX,
+    SAMPLED_KEYS,
+    SHADOW_MAX_AGE,
+    SLOW_SCAN_INTERVAL,
+    SWITCH_DEFINITIONS,
+    TRANSIENT_HOLD,
+    TRANSIENT_POWER_STEP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+)
+from .connection import (
+    PRIORITY_READ,
+    PRIORITY_READBACK,
+    PRIORITY_SAMPLE,
+    SerialSettings,
+    SolakonConnection,
+    async_release_connection,
+    get_connection,
+)
+from .metrics import PollMetrics
+from .registers import (
+    COMPILED_REGISTERS,
+    ReadBlock,
+    decode_buffers,
+    encode_register_value,
+    plan_read_blocks,
+    registers_for_poll_classes,
+)
+from .sampling import SampleBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Register read once after connecting to verify the device answers
+PROBE_ADDRESS = 30000
+
+# Hubs probed by the config flow are kept this long for the entry setup
+PENDING_HUBS = "pending_hubs"
+PENDING_HUB_TIMEOUT = 60
+
+# Connection handshake states
+HANDSHAKE_DISCONNECTED = "disconnected"
+HANDSHAKE_CONNECTING = "connecting"
+HANDSHAKE_PROBING = "probing"
+HANDSHAKE_READY = "ready"
+HANDSHAKE_PROBE_FAILED = "probe_failed"
+
+# Registers describing the device in the device registry
+IDENTITY_KEYS = ("model_name", "serial_number", "master_version")
+
+# Power values watched for load steps, with their factor to W
+TRANSIENT_KEYS = {"active_power": 1000, "battery_combined_power": 1}
+
+# Registers written by entities, whose last read values are shadowed
+WRITABLE_KEYS = frozenset(
+    definition["register"]
+    for definition in (*NUMBER_DEFINITIONS.values(), *SWITCH_DEFINITIONS.values())
+)
+
+
+def connection_options(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the hub connection arguments stored in config entry data."""
+    transport = data.get(CONF_TRANSPORT, TRANSPORT_TCP)
+    if transport != TRANSPORT_SERIAL:
+        return {"host": data["host"], "port": data["port"], "transport": transport}
+    return {
+        "host": data[CONF_SERIAL_PORT],
+        "port": None,
+        "transport": transport,
+        "serial_settings": SerialSettings(
+            data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+            data.get(CONF_PARITY, DEFAULT_PARITY),
+            data.get(CONF_STOPBITS, DEFAULT_STOPBITS),
+        ),
+    }
+
+
+@callback
+def async_store_pending_hub(
+    hass: HomeAssistant, unique_id: str, hub: SolakonModbusHub
+) -> None:
+    """Keep a probed hub from the config flow for the entry setup to adopt."""
+    pending = hass.data.setdefault(DOMAIN, {}).setdefault(PENDING_HUBS, {})
+
+    if previous := pending.pop(unique_id, None):
+        previous[1].cancel()
+        hass.async_create_task(previous[0].async_close())
+
+    @callback
+    def _async_expire() -> None:
+        """Close the hub if no entry setup adopted it."""
+        if (stored := pending.get(unique_id)) and stored[0] is hub:
+            pending.pop(unique_id)
+            hass.async_create_task(hub.async_close())
+
+    pending[unique_id] = (
+        hub,
+        hass.loop.call_later(PENDING_HUB_TIMEOUT, _async_expire),
+    )
+
+
+@callback
+def async_pop_pending_hub(
+    hass: HomeAssistant, unique_id: str | None
+) -> SolakonModbusHub | None:
+    """Return the hub probed by the config flow for this entry, if any."""
+    pending = hass.data.get(DOMAIN, {}).get(PENDING_HUBS, {})
+    if unique_id is None or (stored := pending.pop(unique_id, None)) is None:
+        return None
+    stored[1].cancel()
+    return stored[0]
+
 
 class SolakonModbusHub:
     """Modbus hub for Solakon ONE device."""
@@ -20,271 +156,663 @@ class SolakonModbusHub:
         self,
         hass: HomeAssistant,
         host: str,
-        port: int,
+        port: int | None,
         slave_id: int,
         scan_interval: int,
+        max_read_gap: int = DEFAULT_MAX_READ_GAP,
+        fast_scan_interval: int = DEFAULT_FAST_SCAN_INTERVAL,
+        device_info: dict[str, Any] | None = None,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        idle_scan_interval: int = DEFAULT_IDLE_SCAN_INTERVAL,
+        min_scan_interval: int = DEFAULT_MIN_SCAN_INTERVAL,
+        transport: str = TRANSPORT_TCP,
+        serial_settings: SerialSettings | None = None,
     ) -> None:
-        """Initialize the Modbus hub."""
+        """Initialize the Modbus hub.
+
+        For the serial transport ``host`` is the serial device and ``port``
+        is unused.
+        """
         self._hass = hass
         self._host = host
         self._port = port
         self._slave_id = slave_id
+        # RTU transports never pipeline
+        self.pipeline_depth = pipeline_depth if transport == TRANSPORT_TCP else 1
+        # Hubs for devices behind the same gateway or on the same bus share
+        # one connection
+        self._connection: SolakonConnection | None = get_connection(
+            host, port, slave_id, self.pipeline_depth, transport, serial_settings
+        )
+        self._handshake_lock = asyncio.Lock()
+        self._handshake_state = HANDSHAKE_DISCONNECTED
+        # Connection generation the last probe was made on
+        self._probe_generation = -1
+        # Last request of the current poll that got no answer
+        self._poll_error: Exception | None = None
+        self._max_read_gap = max_read_gap
+        # Configured seconds between reads per poll class, None means read
+        # once, and the intervals currently used by adaptive polling
+        self._base_intervals: dict[str, int | None] = {}
+        self._poll_intervals: dict[str, int | None] = {}
+        self.poll_mode = POLL_MODE_NORMAL
+        self._transient_until = 0.0
+        self.set_poll_intervals(
+            scan_interval, fast_scan_interval, idle_scan_interval, min_scan_interval
+        )
+        self.transport = transport
+        self._last_poll: dict[str, float] = {}
+        # Read plans cached per combination of due poll classes and per
+        # tuple of keys read on demand
+        self._read_plans: dict[
+            frozenset[str] | tuple[str, ...], list[ReadBlock]
+        ] = {}
+        self._data: dict[str, Any] = {}
+        self.metrics = PollMetrics(rtu=transport != TRANSPORT_TCP)
+        # Last read value and read time of every writable register, and
+        # when each register was last written
+        self._shadow: dict[str, tuple[Any, float]] = {}
+        self._written_at: dict[str, float] = {}
+        self._device_info = device_info
+        # Ring buffers of the sampled registers while sampling is enabled,
+        # and the start of the window published with the next aggregate
+        self.sample_interval: float = 0
+        self._samples: dict[str, SampleBuffer] = {}
+        self._sample_window_start = 0.0
+        self._sampling = False
+        self._polling = False
+
+    def set_sample_interval(self, sample_interval: float) -> None:
+        """Sample the fast power registers every ``sample_interval`` seconds.
+
+        Zero disables sampling and the sampled registers are published as
+        read by the polls again. The buffers are sized from the scan
+        interval, so call this after changing it.
+        """
+        if not sample_interval:
+            self.sample_interval = 0
+            self._samples.clear()
+            for key in SAMPLED_KEYS:
+                self._data.pop(f"{key}{SAMPLE_STATS_SUFFIX}", None)
+            return
+        self.sample_interval = max(sample_interval, MIN_SAMPLE_INTERVAL)
+        # Leave room for polls that come late, so a window is never cut short
+        size = math.ceil(
+            SAMPLE_BUFFER_WINDOWS * self.scan_interval / self.sample_interval
+        )
+        for key in SAMPLED_KEYS:
+            buffer = self._samples.get(key)
+            if buffer is None or buffer.size != size:
+                self._samples[key] = SampleBuffer(size)
+
+    def set_max_read_gap(self, max_read_gap: int) -> None:
+        """Change the gap tolerated inside a read block and replan reads."""
+        if max_read_gap != self._max_read_gap:
+            self._max_read_gap = max_read_gap
+            self._read_plans.clear()
+
+    def set_poll_intervals(
+        self,
+        scan_interval: int,
+        fast_scan_interval: int,
+        idle_scan_interval: int,
+        min_scan_interval: int,
+    ) -> None:
+        """Change the poll intervals, keeping the connection and data."""
         self.scan_interval = scan_interval
-        self._client = None
-        self._lock = asyncio.Lock()
+        self._base_intervals = {
+            POLL_STATIC: None,
+            POLL_SLOW: max(SLOW_SCAN_INTERVAL, scan_interval),
+            POLL_NORMAL: scan_interval,
+            POLL_FAST: min(fast_scan_interval, scan_interval),
+        }
+        self._idle_scan_interval = idle_scan_interval
+        self._min_scan_interval = min_scan_interval
+        self._apply_poll_mode()
+
+    def _apply_poll_mode(self) -> None:
+        """Derive the poll intervals in use from the configured ones."""
+        intervals = dict(self._base_intervals)
+        if self.poll_mode == POLL_MODE_IDLE:
+            for poll_class in (POLL_NORMAL, POLL_FAST):
+                intervals[poll_class] = max(
+                    intervals[poll_class], self._idle_scan_interval
+                )
+        elif self.poll_mode == POLL_MODE_TRANSIENT:
+            intervals[POLL_FAST] = min(
+                intervals[POLL_FAST], self._min_scan_interval
+            )
+        self._poll_intervals = intervals
+
+    @property
+    def update_interval(self) -> int:
+        """Return the tick interval needed by the fastest poll class."""
+        return min(
+            interval
+            for interval in self._poll_intervals.values()
+            if interval is not None
+        )
 
     @property
     def connected(self) -> bool:
         """Check if client is connected."""
-        return self._client is not None and self._client.connected
+        return self._connection is not None and self._connection.connected
+
+    @property
+    def handshake_state(self) -> str:
+        """Return the state of the connection handshake."""
+        if self._handshake_state in (HANDSHAKE_READY, HANDSHAKE_PROBE_FAILED) and (
+            not self.connected
+            or self._probe_generation != self._connection.generation
+        ):
+            return HANDSHAKE_DISCONNECTED
+        return self._handshake_state
 
     async def async_setup(self) -> None:
-        """Set up the Modbus connection."""
+        """Connect and probe the device unless a live handshake exists."""
+        if self._connection is None:
+            raise ConnectionError("Hub has been closed")
+
+        async with self._handshake_lock:
+            if self.handshake_state in (HANDSHAKE_READY, HANDSHAKE_PROBE_FAILED):
+                return
+            self._handshake_state = HANDSHAKE_CONNECTING
+            try:
+                await self._connection.async_connect()
+                await self._async_probe()
+            except Exception:
+                self._handshake_state = HANDSHAKE_DISCONNECTED
+                raise
+
+    async def _async_probe(self) -> None:
+        """Probe the device once on the current connection."""
+        # The result is reused by async_test_connection until the
+        # connection drops
+        self._handshake_state = HANDSHAKE_PROBING
+        generation = self._connection.generation
         try:
-            _LOGGER.info(f"Attempting to connect to Modbus TCP at {self._host}:{self._port}")
-            
-            # Create client exactly like the working script
-            self._client = AsyncModbusTcpClient(
-                host=self._host,
-                port=self._port,
-                timeout=5  # Same timeout as working script
+            result = await self._connection.async_read_holding_registers(
+                self._slave_id, PROBE_ADDRESS, 1
             )
-            
-            # Connect to the device
-            await self._client.connect()
-            
-            if self._client.connected:
-                _LOGGER.info(f"Successfully connected to {self._host}:{self._port}")
-                
-                # Test the connection with a simple read
-                # Using device_id parameter like the working script
-                try:
-                    test_result = await self._client.read_holding_registers(
-                        address=30000,
-                        count=1,
-                        device_id=self._slave_id  # Using device_id like your working script
-                    )
-                    
-                    if test_result.isError():
-                        _LOGGER.warning(f"Test read returned error: {test_result}")
-                    else:
-                        _LOGGER.info(f"Test read successful, slave_id={self._slave_id}")
-                except Exception as e:
-                    _LOGGER.warning(f"Test read exception: {e}")
-            else:
-                _LOGGER.error(f"Failed to connect to {self._host}:{self._port}")
-                raise ConnectionError(f"Failed to connect to {self._host}:{self._port}")
-                
         except Exception as err:
-            _LOGGER.error(f"Connection setup error: {err}")
-            raise
+            # No answer at all may mean the link is unusable, not just the probe
+            await self._connection.async_record_failure(self._slave_id, err)
+            raise ConnectionError(f"Test read exception: {err}") from err
+
+        self._probe_generation = generation
+        self._connection.record_answer(self._slave_id)
+        self._connection.circuit.record_success()
+        if not result.isError():
+            await self._connection.async_detect_pipeline(
+                self._slave_id, PROBE_ADDRESS
+            )
+        if result.isError():
+            _LOGGER.warning(f"Test read returned error: {result}")
+            self._handshake_state = HANDSHAKE_PROBE_FAILED
+        else:
+            _LOGGER.info(f"Test read successful, slave_id={self._slave_id}")
+            self._handshake_state = HANDSHAKE_READY
 
     async def async_close(self) -> None:
-        """Close the Modbus connection."""
-        if self._client:
-            try:
-                self._client.close()
-            except Exception:
-                pass
+        """Release the hub's share of the Modbus connection."""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await async_release_connection(
+                connection, self._slave_id, self.pipeline_depth
+            )
+        self._handshake_state = HANDSHAKE_DISCONNECTED
 
-    async def async_test_connection(self) -> bool:
-        """Test the Modbus connection."""
-        try:
-            if not self._client:
-                await self.async_setup()
-            
-            if not self.connected:
-                _LOGGER.error("Client not connected for test")
-                return False
-            
-            # Test with device_id parameter (like your working script)
-            _LOGGER.debug(f"Testing connection to {self._host}:{self._port} with slave_id={self._slave_id}")
-            
-            result = await self._client.read_holding_registers(
-                address=30000,  # Model name register
-                count=1,
-                device_id=self._slave_id  # Using device_id
+    @property
+    def circuit_open(self) -> bool:
+        """Return whether reconnect attempts are currently backed off."""
+        return self._connection is not None and self._connection.circuit_open
+
+    @property
+    def connection_health(self) -> dict[str, Any]:
+        """Return the health of the connection to the device."""
+        health: dict[str, Any] = {
+            "handshake": self.handshake_state,
+            "transport": self.transport,
+            "poll_mode": self.poll_mode,
+        }
+        if self._connection is not None:
+            circuit = self._connection.circuit
+            health.update(
+                {
+                    "gateway": self._connection.key,
+                    "shared_by": self._connection.users,
+                    "circuit": circuit.state,
+                    "failures": circuit.failures,
+                    "retry_in": round(circuit.retry_in, 1),
+                    "last_error": circuit.last_error,
+                }
             )
+        return health
 
-            if not result.isError():
-                _LOGGER.info("Connection test successful")
-                return True
-            
-            _LOGGER.error(f"Connection test failed: {result}")
-            return False
-                
+    @property
+    def metrics_data(self) -> dict[str, Any]:
+        """Return the request metrics together with connection counters."""
+        data = self.metrics.as_dict()
+        if self._connection is not None:
+            data["reconnects"] = max(0, self._connection.generation - 1)
+            data["queued_requests"] = self._connection.queued_requests
+        return data
+
+    async def async_test_connection(self) -> bool:
+        """Return whether the handshake probe succeeded."""
+        try:
+            await self.async_setup()
         except Exception as err:
             _LOGGER.error(f"Connection test error: {err}")
             return False
 
+        if self.handshake_state == HANDSHAKE_READY:
+            return True
+
+        _LOGGER.error(f"Connection test failed for {self._connection.key} with slave_id={self._slave_id}")
+        return False
+
+    @property
+    def device_info(self) -> dict[str, Any] | None:
+        """Return the cached device identity, if it has been read."""
+        return self._device_info
+
     async def async_get_device_info(self) -> dict[str, Any]:
-        """Get device information."""
-        try:
-            if not self.connected:
-                await self.async_setup()
-                
-            if not self._client or not self.connected:
-                return {
-                    "manufacturer": "Solakon",
-                    "model": "Solakon ONE",
-                    "name": "Solakon ONE",
-                }
-            
-            model_name = "Solakon ONE"
-            serial_number = None
+        """Get device information, reading it from the device only once."""
+        if self._device_info is not None:
+            return self._device_info
 
+        data = {key: self._data[key] for key in IDENTITY_KEYS if key in self._data}
+        if not data:
             try:
-                # Read model name - using device_id like working script
-                model_result = await self._client.read_holding_registers(
-                    address=30000,
-                    count=16,
-                    device_id=self._slave_id
-                )
-                
-                # Read serial number
-                serial_result = await self._client.read_holding_registers(
-                    address=30016,
-                    count=16,
-                    device_id=self._slave_id
-                )
-                
-                if not model_result.isError():
-                    # Convert registers to string (matching your working script)
-                    chars = []
-                    for val in model_result.registers:
-                        chars.append(chr((val >> 8) & 0xFF))
-                        chars.append(chr(val & 0xFF))
-                    decoded = ''.join(chars).rstrip('\x00').strip()
-                    if decoded:
-                        model_name = decoded
-                        
-                if not serial_result.isError():
-                    chars = []
-                    for val in serial_result.registers:
-                        chars.append(chr((val >> 8) & 0xFF))
-                        chars.append(chr(val & 0xFF))
-                    decoded = ''.join(chars).rstrip('\x00').strip()
-                    if decoded:
-                        serial_number = decoded
-                    
-            except Exception as e:
-                _LOGGER.debug(f"Device info read error: {e}")
-            
-            return {
-                "manufacturer": "Solakon",
-                "model": model_name,
-                "name": model_name,
-                "serial_number": serial_number,
-            }
-            
-        except Exception as err:
-            _LOGGER.error(f"Failed to get device info: {err}")
+                if not self.connected:
+                    await self.async_setup()
+                data = await self.async_read_keys(IDENTITY_KEYS)
+            except Exception as err:
+                _LOGGER.error(f"Failed to get device info: {err}")
+
+        if not data:
+            # Do not cache the fallback so the next call tries again
             return {
                 "manufacturer": "Solakon",
                 "model": "Solakon ONE",
                 "name": "Solakon ONE",
             }
 
+        self._device_info = self._build_device_info(data)
+        return self._device_info
+
+    @staticmethod
+    def _build_device_info(data: dict[str, Any]) -> dict[str, Any]:
+        """Build the device identity from decoded register values."""
+        model_name = data.get("model_name") or "Solakon ONE"
+        sw_version = data.get("master_version")
+        return {
+            "manufacturer": "Solakon",
+            "model": model_name,
+            "name": model_name,
+            "serial_number": data.get("serial_number"),
+            "sw_version": str(sw_version) if sw_version is not None else None,
+        }
+
+    async def async_read_keys(
+        self, keys: tuple[str, ...], priority: int = PRIORITY_READ
+    ) -> dict[str, Any]:
+        """Read only the blocks covering the given register keys."""
+        start = time.monotonic()
+        data = await self._async_read_keys(keys, priority)
+        self._store_shadow(data, start)
+        self._data.update(data)
+        return data
+
+    async def _async_read_keys(
+        self, keys: tuple[str, ...], priority: int
+    ) -> dict[str, Any]:
+        """Read and decode the blocks covering the given register keys."""
+        buffers: list[tuple[ReadBlock, bytes]] = []
+        if (plan := self._read_plans.get(keys)) is None:
+            plan = plan_read_blocks(
+                {key: COMPILED_REGISTERS[key] for key in keys},
+                max_gap=self._max_read_gap,
+            )
+            self._read_plans[keys] = plan
+        for block in plan:
+            await self._async_read_block(block, buffers, priority)
+        return decode_buffers(buffers)
+
+    async def async_sample(self) -> None:
+        """Read the sampled registers once into their ring buffers.
+
+        Samples are skipped while the previous one or a poll runs, as the
+        poll reads the same registers, while the device is idle and while it
+        is unreachable.
+        """
+        if (
+            not self._samples
+            or self._sampling
+            or self._polling
+            or self.poll_mode == POLL_MODE_IDLE
+            or not self.connected
+            or self.circuit_open
+        ):
+            return
+        self._sampling = True
+        try:
+            data = await self._async_read_keys(SAMPLED_KEYS, PRIORITY_SAMPLE)
+        except Exception as err:
+            _LOGGER.debug(f"Failed to sample: {err}")
+            return
+        finally:
+            self._sampling = False
+        self._record_samples(data)
+
+    def _record_samples(self, data: dict[str, Any]) -> None:
+        """Add the sampled values found in ``data`` to their buffers."""
+        for key, buffer in self._samples.items():
+            if (value := data.get(key)) is not None:
+                buffer.append(value)
+
+    def _publish_samples(self, data: dict[str, Any], now: float) -> None:
+        """Replace polled sampled values by their aggregate once per window.
+
+        Between windows the sampled values are dropped from ``data`` so the
+        last published aggregate stays in place.
+        """
+        if not self._samples:
+            return
+        self._record_samples(data)
+        slack = self.update_interval / 2
+        if now - self._sample_window_start < self.scan_interval - slack:
+            for key in self._samples:
+                data.pop(key, None)
+            return
+
+        self._sample_window_start = now
+        for key, buffer in self._samples.items():
+            if (stats := buffer.aggregate()) is None:
+                continue
+            buffer.clear()
+            data[key] = stats.pop("mean")
+            data[f"{key}{SAMPLE_STATS_SUFFIX}"] = stats
+
+    async def async_write_verified(
+        self, key: str, value: float
+    ) -> dict[str, Any] | None:
+        """Write a register and read back only that register.
+
+        Returns the decoded readback, which is empty if only the readback
+        failed, or None if the write itself failed.
+        """
+        # The shadow is stale from here on until the readback refreshes it
+        self._shadow.pop(key, None)
+        success = await self.async_write_value(key, value)
+        self._written_at[key] = time.monotonic()
+        if not success:
+            return None
+        return await self.async_read_keys((key,), PRIORITY_READBACK)
+
+    def shadow_value(self, key: str, max_age: float = SHADOW_MAX_AGE) -> Any:
+        """Return the shadowed value of a writable register if fresh enough."""
+        if (entry := self._shadow.get(key)) is None:
+            return None
+        value, read_at = entry
+        if time.monotonic() - read_at > max_age:
+            return None
+        return value
+
+    async def async_write_bit(
+        self, key: str, bit: int, state: bool
+    ) -> dict[str, Any] | None:
+        """Set or clear one bit of a register without touching the others.
+
+        Returns the decoded readback, which is empty if only the readback
+        failed, or None if the write itself failed.
+        """
+        if not self.connected:
+            return None
+
+        address = REGISTERS[key]["address"]
+
+        def shadow() -> int | None:
+            # Taken inside the connection slot, so a write of another bit
+            # of this register that finished meanwhile is included
+            current = self.shadow_value(key)
+            return None if current is None else int(current)
+
+        def written(value: int | None) -> None:
+            self._written_at[key] = time.monotonic()
+            if value is None:
+                self._shadow.pop(key, None)
+            else:
+                self._shadow[key] = (value, time.monotonic())
+
+        try:
+            value = await self._connection.async_modify_register(
+                self._slave_id,
+                address,
+                0xFFFF & ~(1 << bit),
+                (1 << bit) if state else 0,
+                shadow,
+                written,
+                self.metrics,
+            )
+        except Exception as err:
+            _LOGGER.error(f"Failed to write bit {bit} of register at {address}: {err}")
+            self._shadow.pop(key, None)
+            self._written_at[key] = time.monotonic()
+            return None
+
+        data = await self.async_read_keys((key,), PRIORITY_READBACK)
+        if not data and value is not None:
+            # Only the readback failed, the written value is still known
+            data = {key: value}
+        return data
+
+    def reset_poll_schedule(self) -> None:
+        """Make every poll class due on the next read."""
+        self._last_poll.clear()
+
     async def async_read_registers(self) -> dict[str, Any]:
-        """Read all configured registers."""
+        """Read the registers whose poll class is due and return all values."""
         data = {}
         
-        if not self._client or not self.connected:
-            try:
-                await self.async_setup()
-            except Exception:
-                return data
+        try:
+            await self.async_setup()
+        except Exception:
+            return data
                 
         if not self.connected:
             _LOGGER.error("Client not connected for register read")
             return data
 
-        async with self._lock:
-            for key, config in REGISTERS.items():
-                try:
-                    # Skip bitfield types for now
-                    if config.get("type") == "bitfield16":
-                        continue
-                    
-                    # Read register with device_id parameter (like working script)
-                    result = await self._client.read_holding_registers(
-                        address=config["address"],
-                        count=config.get("count", 1),
-                        device_id=self._slave_id
-                    )
-                    
-                    if result.isError():
-                        _LOGGER.debug(
-                            f"Error reading register {key} at address {config['address']}: {result}"
-                        )
-                        continue
-                    
-                    # Process the register value
-                    value = self._process_register_value(
-                        result.registers, config
-                    )
-                    
-                    if value is not None:
-                        data[key] = value
-                        
-                except Exception as err:
-                    _LOGGER.debug(
-                        f"Failed to read register {key} at address {config.get('address', 'unknown')}: {err}"
-                    )
-                    
-        return data
+        now = time.monotonic()
+        due = self._due_poll_classes(now)
+        if not due:
+            return dict(self._data)
+
+        failed: set[str] = set()
+        self._poll_error = None
+        plan = self._get_read_plan(due)
+        buffers: list[tuple[ReadBlock, bytes]] = []
+        reads = self.metrics.reads
+        start = time.monotonic()
+        # Decoding is batched with polls of other slave IDs on the gateway
+        batch = self._connection.decode_batch
+        batch.begin()
+        self._polling = True
+        try:
+            if self._connection.active_depth > 1:
+                # Let the pipeline carry all blocks of the poll at once
+                results = await asyncio.gather(
+                    *(self._async_read_block(block, buffers) for block in plan)
+                )
+            else:
+                # One block at a time keeps the queue fair to other slave IDs
+                results = [
+                    await self._async_read_block(block, buffers) for block in plan
+                ]
+        except BaseException:
+            batch.cancel()
+            raise
+        finally:
+            self._polling = False
+        self.metrics.record_poll(
+            time.monotonic() - start, self.metrics.reads - reads
+        )
+        data = await batch.async_decode(buffers)
+        for block, success in zip(plan, results):
+            if not success:
+                failed.update(field.poll for field in block.fields)
+
+        if not data:
+            if self._poll_error is not None and self._connection is not None:
+                # Nothing answered, the connection decides whether it is the
+                # link or only this slave
+                await self._connection.async_record_failure(
+                    self._slave_id, self._poll_error
+                )
+            return data
+        if self._connection is not None:
+            self._connection.record_answer(self._slave_id)
+
+        self._store_shadow(data, start)
+        self._adapt_poll_intervals(data, now)
+        self._publish_samples(data, now)
+        self._data.update(data)
+        for poll_class in due:
+            if poll_class == POLL_STATIC and POLL_STATIC in failed:
+                # Keep retrying identity registers until they were read once
+                continue
+            self._last_poll[poll_class] = now
+
+        if (
+            self._device_info is None
+            and POLL_STATIC in due
+            and POLL_STATIC not in failed
+        ):
+            self._device_info = self._build_device_info(self._data)
+
+        return dict(self._data)
+
+    def _adapt_poll_intervals(self, data: dict[str, Any], now: float) -> None:
+        """Stretch or shorten the poll intervals from the latest values."""
+        previous = self._data
+        for key, factor in TRANSIENT_KEYS.items():
+            if (
+                data.get(key) is not None
+                and previous.get(key) is not None
+                and abs(data[key] - previous[key]) * factor >= TRANSIENT_POWER_STEP
+            ):
+                self._transient_until = now + TRANSIENT_HOLD
+
+        pv_power = data.get("total_pv_power", previous.get("total_pv_power"))
+        battery_power = data.get(
+            "battery_combined_power", previous.get("battery_combined_power")
+        )
+        if now < self._transient_until:
+            mode = POLL_MODE_TRANSIENT
+        elif (
+            pv_power is not None
+            and pv_power <= 0
+            and battery_power is not None
+            and abs(battery_power) < IDLE_BATTERY_POWER
+        ):
+            mode = POLL_MODE_IDLE
+        else:
+            mode = POLL_MODE_NORMAL
+
+        if mode == self.poll_mode:
+            return
+        self.poll_mode = mode
+        self._apply_poll_mode()
+        _LOGGER.debug(
+            f"Switching to {mode} polling, every {self.update_interval}s"
+        )
+
+    def _due_poll_classes(self, now: float) -> frozenset[str]:
+        """Return the poll classes that have to be read on this tick."""
+        # Ticks never line up exactly, so allow half a tick of slack
+        slack = self.update_interval / 2
+        due = set()
+        for poll_class, interval in self._poll_intervals.items():
+            last = self._last_poll.get(poll_class)
+            if last is None or (
+                interval is not None and now - last >= interval - slack
+            ):
+                due.add(poll_class)
+        return frozenset(due)
+
+    def _get_read_plan(self, poll_classes: frozenset[str]) -> list[ReadBlock]:
+        """Return the coalesced read plan for a set of poll classes."""
+        if (plan := self._read_plans.get(poll_classes)) is None:
+            plan = plan_read_blocks(
+                registers_for_poll_classes(poll_classes),
+                max_gap=self._max_read_gap,
+            )
+            self._read_plans[poll_classes] = plan
+        return plan
+
+    async def _async_read_block(
+        self,
+        block: ReadBlock,
+        buffers: list[tuple[ReadBlock, bytes]],
+        priority: int = PRIORITY_READ,
+    ) -> bool:
+        """Read one register block and add its packed buffer to ``buffers``."""
+        try:
+            result = await self._connection.async_read_holding_registers(
+                self._slave_id, block.start, block.count, priority, self.metrics
+            )
+        except Exception as err:
+            self._poll_error = err
+            _LOGGER.debug(
+                f"Failed to read block {block.start}-{block.start + block.count - 1}: {err}"
+            )
+            return False
+
+        if result.isError():
+            _LOGGER.debug(
+                f"Error reading block {block.start}-{block.start + block.count - 1}: {result}"
+            )
+            # Some devices reject reads spanning unmapped addresses, so fall
+            # back to reading the values of this block one by one
+            if len(block.fields) == 1:
+                return False
+            success = True
+            for single in block.split():
+                success &= await self._async_read_block(single, buffers, priority)
+            return success
+
+        try:
+            buffers.append((block, block.pack(result.registers)))
+        except Exception as err:
+            _LOGGER.debug(f"Malformed response for block {block}: {err}")
+            return False
+        return True
+
+    def _store_shadow(self, data: dict[str, Any], read_at: float) -> None:
+        """Remember values of writable registers read since ``read_at``.
+
+        A register written after ``read_at`` may have been read before the
+        write, so its value is dropped from ``data`` instead.
+        """
+        for key in WRITABLE_KEYS.intersection(data):
+            if self._written_at.get(key, read_at) > read_at:
+                del data[key]
+            else:
+                self._shadow[key] = (data[key], read_at)
     
     async def async_read_all_data(self) -> dict[str, Any]:
         """Read all data from the device."""
         return await self.async_read_registers()
 
-    def _process_register_value(
-        self, registers: list[int], config: dict[str, Any]
-    ) -> Any:
-        """Process register values based on their configuration."""
-        if not registers:
-            return None
-            
-        data_type = config.get("type", "uint16")
-        scale = config.get("scale", 1)
-        
-        try:
-            if data_type in ("uint16", "u16"):
-                value = registers[0]
-            elif data_type in ("int16", "i16"):
-                value = registers[0]
-                if value > 0x7FFF:  # Using same conversion as working script
-                    value = value - 0x10000
-            elif data_type in ("uint32", "u32"):
-                if len(registers) < 2:
-                    return None
-                value = (registers[0] << 16) | registers[1]
-            elif data_type in ("int32", "i32"):
-                if len(registers) < 2:
-                    return None
-                value = (registers[0] << 16) | registers[1]
-                if value > 0x7FFFFFFF:  # Using same conversion as working script
-                    value = value - 0x100000000
-            elif data_type == "string":
-                # Convert registers to string (exactly like working script)
-                chars = []
-                for val in registers:
-                    chars.append(chr((val >> 8) & 0xFF))
-                    chars.append(chr(val & 0xFF))
-                text = ''.join(chars).rstrip('\x00').strip()
-                return text if text else None
-            else:
-                value = registers[0]
-                
-            # Apply scaling if defined
-            if scale != 1 and value is not None:
-                value = float(value) / scale
-                
-            return value
-            
-        except Exception as err:
-            _LOGGER.debug(f"Failed to process register value: {err}")
-            return None
+    async def async_write_value(self, key: str, value: float) -> bool:
+        """Encode a value for a register definition and write it."""
+        address = REGISTERS[key]["address"]
+        registers = encode_register_value(key, value)
+        if len(registers) == 1:
+            return await self.async_write_register(address, registers[0])
+        return await self.async_write_registers(address, registers)
 
     async def async_write_register(
         self, address: int, value: int
@@ -293,20 +821,16 @@ class SolakonModbusHub:
         if not self.connected:
             return False
 
-        async with self._lock:
-            try:
-                # Using device_id parameter
-                result = await self._client.write_register(
-                    address=address,
-                    value=value,
-                    device_id=self._slave_id
-                )
-                
-                return not result.isError()
-                
-            except Exception as err:
-                _LOGGER.error(f"Failed to write register at {address}: {err}")
-                return False
+        try:
+            result = await self._connection.async_write_register(
+                self._slave_id, address, value, self.metrics
+            )
+
+            return not result.isError()
+
+        except Exception as err:
+            _LOGGER.error(f"Failed to write register at {address}: {err}")
+            return False
 
     async def async_write_registers(
         self, address: int, values: list[int]
@@ -315,17 +839,13 @@ class SolakonModbusHub:
         if not self.connected:
             return False
 
-        async with self._lock:
-            try:
-                # Using device_id parameter
-                result = await self._client.write_registers(
-                    address=address,
-                    values=values,
-                    device_id=self._slave_id
-                )
-                
-                return not result.isError()
-                
-            except Exception as err:
-                _LOGGER.error(f"Failed to write registers at {address}: {err}")
-                return False
\ No newline at end of file
+        try:
+            result = await self._connection.async_write_registers(
+                self._slave_id, address, values, self.metrics
+            )
+
+            return not result.isError()
+
+        except Exception as err:
+            _LOGGER.error(f"Failed to write registers at {address}: {err}")
+            return False
\ No newline at end of file
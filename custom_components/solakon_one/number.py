@@ -2,60 +2,85 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from dataclasses import dataclass
 
-from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.components.number import (
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, NUMBER_DEFINITIONS, REGISTERS
+from .entity import SolakonEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Solakon ONE number entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = data["coordinator"]
-    hub = data["hub"]
+@dataclass(frozen=True, kw_only=True)
+class SolakonNumberEntityDescription(NumberEntityDescription):
+    """Describes a writable Solakon ONE value."""
 
-    device_info = await hub.async_get_device_info()
+    register: str
 
-    entities: list[SolakonNumber] = []
+
+def _build_descriptions() -> tuple[SolakonNumberEntityDescription, ...]:
+    """Compile the number definitions into entity descriptions."""
+    descriptions = []
     for key, definition in NUMBER_DEFINITIONS.items():
-        register_key = definition["register"]
-        if register_key not in REGISTERS:
+        if definition["register"] not in REGISTERS:
             _LOGGER.warning(
-                "Skipping number %s: register %s not defined", key, register_key
+                "Skipping number %s: register %s not defined",
+                key,
+                definition["register"],
             )
             continue
-
-        entities.append(
-            SolakonNumber(
-                coordinator=coordinator,
-                config_entry=config_entry,
-                hub=hub,
-                number_key=key,
-                definition=definition,
-                device_info=device_info,
+        descriptions.append(
+            SolakonNumberEntityDescription(
+                key=key,
+                name=definition["name"],
+                icon=definition.get("icon"),
+                native_unit_of_measurement=definition.get("unit"),
+                native_min_value=definition.get("min"),
+                native_max_value=definition.get("max"),
+                native_step=definition.get("step"),
+                register=definition["register"],
             )
         )
+    return tuple(descriptions)
+
+
+NUMBER_DESCRIPTIONS = _build_descriptions()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Solakon ONE number entities."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
 
-    if entities:
-        async_add_entities(entities)
+    async_add_entities(
+        SolakonNumber(
+            data["coordinator"],
+            config_entry,
+            data["hub"],
+            description,
+            data["device_info"],
+        )
+        for description in NUMBER_DESCRIPTIONS
+    )
 
 
-class SolakonNumber(CoordinatorEntity, NumberEntity):
+class SolakonNumber(SolakonEntity, NumberEntity):
     """Representation of a writable Solakon ONE value."""
 
+    entity_description: SolakonNumberEntityDescription
     _attr_has_entity_name = True
     _attr_mode = NumberMode.AUTO
 
@@ -64,89 +89,48 @@ class SolakonNumber(CoordinatorEntity, NumberEntity):
         coordinator,
         config_entry: ConfigEntry,
         hub,
-        number_key: str,
-        definition: dict[str, Any],
-        device_info: dict[str, Any],
+        description: SolakonNumberEntityDescription,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, config_entry, description, device_info)
         self._hub = hub
-        self._number_key = number_key
-        self._definition = definition
-        self._register_key = definition["register"]
+        self._register_key = description.register
         self._register_config = REGISTERS[self._register_key]
-        self._attr_unique_id = f"{config_entry.entry_id}_{number_key}"
-        self.entity_id = f"number.solakon_one_{number_key}"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=config_entry.data.get("name", "Solakon ONE"),
-            manufacturer=device_info.get("manufacturer", "Solakon"),
-            model=device_info.get("model", "One"),
-            sw_version=device_info.get("version"),
-            serial_number=device_info.get("serial"),
-        )
-
-        self._attr_name = definition["name"]
-        self._attr_icon = definition.get("icon")
-        self._attr_native_unit_of_measurement = definition.get("unit")
-        if (min_value := definition.get("min")) is not None:
-            self._attr_native_min_value = min_value
-        if (max_value := definition.get("max")) is not None:
-            self._attr_native_max_value = max_value
-        if (step := definition.get("step")) is not None:
-            self._attr_native_step = step
+        self.entity_id = f"number.solakon_one_{description.key}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the register or availability changed."""
+        if (
+            not self._status_changed()
+            and self._register_key not in self.coordinator.changed_keys
+        ):
+            return
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        value = self.coordinator.data.get(self._register_key)
+        value = (self.coordinator.data or {}).get(self._register_key)
         if value is None:
             return None
         return float(value)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set a new value."""
-        step = self._attr_native_step or 1
+        step = self.native_step or 1
         int_value = int(round(value / step) * step)
+        int_value = max(int_value, int(self.native_min_value))
+        int_value = min(int_value, int(self.native_max_value))
 
-        min_value = self._attr_native_min_value
-        max_value = self._attr_native_max_value
-        if min_value is not None:
-            int_value = max(int_value, int(min_value))
-        if max_value is not None:
-            int_value = min(int_value, int(max_value))
-
-        address = self._register_config["address"]
-        count = self._register_config.get("count", 1)
-
-        if count == 1:
-            success = await self._hub.async_write_register(address, int_value)
-        else:
-            registers = self._value_to_registers(int_value, count)
-            success = await self._hub.async_write_registers(address, registers)
-
-        if not success:
+        data = await self._hub.async_write_verified(self._register_key, int_value)
+        if data is None:
             raise HomeAssistantError(
-                f"Failed to write value {int_value} to register {address}"
+                f"Failed to write value {int_value} to register "
+                f"{self._register_config['address']}"
             )
 
-        # Optimistically update and refresh
-        self.coordinator.data[self._register_key] = int_value
-        self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
-
-    @staticmethod
-    def _value_to_registers(value: int, register_count: int) -> list[int]:
-        """Convert integer value to Modbus register payload."""
-        if register_count == 1:
-            return [value & 0xFFFF]
-
-        if register_count == 2:
-            if value < 0:
-                value = (1 << 32) + value
-            high = (value >> 16) & 0xFFFF
-            low = value & 0xFFFF
-            return [high, low]
-
-        raise ValueError(f"Unsupported register count: {register_count}")
+        # Use the value read back from the device, or the written value if
+        # only the readback failed
+        self.coordinator.async_merge_data(data or {self._register_key: int_value})
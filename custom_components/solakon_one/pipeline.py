@@ -0,0 +1,214 @@
+"""Pipelined Modbus TCP client for Solakon ONE gateways."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+# MBAP header: transaction id, protocol id, length, unit id
+_MBAP = struct.Struct(">HHHB")
+
+FUNC_READ_HOLDING_REGISTERS = 0x03
+FUNC_WRITE_REGISTER = 0x06
+FUNC_WRITE_REGISTERS = 0x10
+FUNC_MASK_WRITE_REGISTER = 0x16
+
+
+class PipelineResponse:
+    """A decoded Modbus response, shaped like the pymodbus responses."""
+
+    __slots__ = ("function_code", "registers", "exception_code")
+
+    def __init__(
+        self,
+        function_code: int,
+        registers: list[int] | None = None,
+        exception_code: int | None = None,
+    ) -> None:
+        """Initialize the response."""
+        self.function_code = function_code
+        self.registers = registers or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:  # noqa: N802 - mirrors the pymodbus API
+        """Return whether the device answered with an exception."""
+        return self.exception_code is not None
+
+    def __str__(self) -> str:
+        """Return a readable representation of the response."""
+        if self.exception_code is not None:
+            return (
+                f"Exception response {self.function_code | 0x80} "
+                f"(code {self.exception_code})"
+            )
+        return f"Response {self.function_code} ({len(self.registers)} registers)"
+
+
+class PipelinedModbusTcpClient:
+    """Modbus TCP client keeping several transactions in flight.
+
+    Requests are written as soon as a pipeline slot is free and replies are
+    matched to their requests by MBAP transaction ID, so gateways that
+    process requests concurrently answer a whole poll in roughly one round
+    trip per ``depth`` requests.
+    """
+
+    def __init__(
+        self, host: str, port: int, depth: int, timeout: float = 5
+    ) -> None:
+        """Initialize the client."""
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(depth)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future[PipelineResponse]] = {}
+        self._transaction_id = 0
+
+    @property
+    def connected(self) -> bool:
+        """Check if the socket is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the socket and start dispatching replies."""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), self._timeout
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug(f"Pipelined connect to {self._host}:{self._port} failed: {err}")
+            return False
+        self._read_task = asyncio.create_task(self._async_read_loop())
+        return True
+
+    def close(self) -> None:
+        """Close the socket and fail all outstanding requests."""
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ConnectionError("Connection closed"))
+
+    def _fail_pending(self, err: Exception) -> None:
+        """Fail every request still waiting for a reply."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(err)
+
+    async def _async_read_loop(self) -> None:
+        """Read replies and hand them to the matching request."""
+        try:
+            while True:
+                header = await self._reader.readexactly(_MBAP.size)
+                transaction_id, _, length, _ = _MBAP.unpack(header)
+                pdu = await self._reader.readexactly(length - 1)
+                future = self._pending.pop(transaction_id, None)
+                if future is None or future.done():
+                    # Late reply to a request that already timed out
+                    continue
+                try:
+                    future.set_result(self._decode(pdu))
+                except Exception as err:
+                    future.set_exception(err)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.debug(f"Pipelined connection to {self._host}:{self._port} lost: {err}")
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionError(f"Connection lost: {err}"))
+
+    @staticmethod
+    def _decode(pdu: bytes) -> PipelineResponse:
+        """Decode the PDU of a reply."""
+        function_code = pdu[0]
+        if function_code & 0x80:
+            return PipelineResponse(function_code & 0x7F, exception_code=pdu[1])
+        if function_code == FUNC_READ_HOLDING_REGISTERS:
+            byte_count = pdu[1]
+            registers = list(struct.unpack_from(f">{byte_count // 2}H", pdu, 2))
+            return PipelineResponse(function_code, registers)
+        return PipelineResponse(function_code)
+
+    async def _async_execute(self, device_id: int, pdu: bytes) -> PipelineResponse:
+        """Send one request and wait for its reply."""
+        async with self._slots:
+            if not self.connected:
+                raise ConnectionError(f"Not connected to {self._host}:{self._port}")
+
+            self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+            transaction_id = self._transaction_id
+            future: asyncio.Future[PipelineResponse] = (
+                asyncio.get_running_loop().create_future()
+            )
+            self._pending[transaction_id] = future
+            self._writer.write(
+                _MBAP.pack(transaction_id, 0, len(pdu) + 1, device_id) + pdu
+            )
+
+            try:
+                return await asyncio.wait_for(future, self._timeout)
+            except asyncio.TimeoutError as err:
+                raise TimeoutError(
+                    f"No reply to transaction {transaction_id} within {self._timeout}s"
+                ) from err
+            finally:
+                self._pending.pop(transaction_id, None)
+
+    async def read_holding_registers(
+        self, address: int, count: int = 1, device_id: int = 1
+    ) -> PipelineResponse:
+        """Read holding registers."""
+        return await self._async_execute(
+            device_id,
+            struct.pack(">BHH", FUNC_READ_HOLDING_REGISTERS, address, count),
+        )
+
+    async def write_register(
+        self, address: int, value: int, device_id: int = 1
+    ) -> PipelineResponse:
+        """Write a single register."""
+        return await self._async_execute(
+            device_id, struct.pack(">BHH", FUNC_WRITE_REGISTER, address, value)
+        )
+
+    async def write_registers(
+        self, address: int, values: list[int], device_id: int = 1
+    ) -> PipelineResponse:
+        """Write multiple registers."""
+        count = len(values)
+        return await self._async_execute(
+            device_id,
+            struct.pack(
+                f">BHHB{count}H",
+                FUNC_WRITE_REGISTERS,
+                address,
+                count,
+                count * 2,
+                *values,
+            ),
+        )
+
+    async def mask_write_register(
+        self,
+        address: int,
+        and_mask: int = 0xFFFF,
+        or_mask: int = 0x0000,
+        device_id: int = 1,
+    ) -> PipelineResponse:
+        """Change bits of a register on the device."""
+        return await self._async_execute(
+            device_id,
+            struct.pack(
+                ">BHHH", FUNC_MASK_WRITE_REGISTER, address, and_mask, or_mask
+            ),
+        )
@@ -0,0 +1,474 @@
+"""Register read planning and decoding for Solakon ONE."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from collections.abc import Callable
+from typing import Any
+
+from .const import (
+    DECODE_BATCH_MAX_WAIT,
+    DEFAULT_MAX_READ_GAP,
+    MAX_READ_REGISTERS,
+    POLL_NORMAL,
+    REGISTERS,
+)
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with Home Assistant, but is not required
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _text(raw: bytes) -> str | None:
+    """Return the text of a null padded string register value."""
+    text = raw.decode("latin-1").rstrip("\x00").strip()
+    return text if text else None
+
+
+def _decode_string(width: int) -> Callable[[bytes, int], str | None]:
+    """Build a decoder for a string spanning ``width`` registers."""
+    size = width * 2
+
+    def decode(buffer: bytes, offset: int) -> str | None:
+        return _text(buffer[offset:offset + size])
+
+    return decode
+
+
+def _decode_struct(fmt: str) -> Callable[[bytes, int], int]:
+    """Build a decoder for a big-endian fixed width integer."""
+    unpack_from = struct.Struct(fmt).unpack_from
+
+    def decode(buffer: bytes, offset: int) -> int:
+        return unpack_from(buffer, offset)[0]
+
+    return decode
+
+
+_DECODERS: dict[str, Callable[[bytes, int], int]] = {
+    "uint16": _decode_struct(">H"),
+    "u16": _decode_struct(">H"),
+    # Bitfields stay raw integers, entities test their bits
+    "bitfield16": _decode_struct(">H"),
+    "int16": _decode_struct(">h"),
+    "i16": _decode_struct(">h"),
+    "uint32": _decode_struct(">I"),
+    "u32": _decode_struct(">I"),
+    "int32": _decode_struct(">i"),
+    "i32": _decode_struct(">i"),
+}
+
+
+# Struct format characters per register type, used for whole block layouts
+_FORMATS: dict[str, str] = {
+    "uint16": "H",
+    "u16": "H",
+    "bitfield16": "H",
+    "int16": "h",
+    "i16": "h",
+    "uint32": "I",
+    "u32": "I",
+    "int32": "i",
+    "i32": "i",
+}
+
+
+# Numpy dtypes matching the struct format characters, strings map to "S<n>"
+_NUMPY_FORMATS: dict[str, str] = {"H": ">u2", "h": ">i2", "I": ">u4", "i": ">i4"}
+
+
+# Packers used to encode values written to the device
+_ENCODERS: dict[str, struct.Struct] = {
+    "uint16": struct.Struct(">H"),
+    "u16": struct.Struct(">H"),
+    "int16": struct.Struct(">h"),
+    "i16": struct.Struct(">h"),
+    "uint32": struct.Struct(">I"),
+    "u32": struct.Struct(">I"),
+    "int32": struct.Struct(">i"),
+    "i32": struct.Struct(">i"),
+}
+
+
+def encode_register_value(key: str, value: float) -> list[int]:
+    """Encode a value into the raw registers of a register definition."""
+    config = REGISTERS[key]
+    packer = _ENCODERS[config.get("type", "uint16")]
+    raw = int(round(value * config.get("scale", 1)))
+    return list(struct.unpack(f">{packer.size // 2}H", packer.pack(raw)))
+
+
+class RegisterField:
+    """A register value decoded from a packed block buffer."""
+
+    __slots__ = (
+        "key", "address", "offset", "width", "decode", "scale", "poll", "fmt"
+    )
+
+    def __init__(
+        self,
+        key: str,
+        address: int,
+        offset: int,
+        width: int,
+        decode: Callable[[bytes, int], Any],
+        scale: float | None,
+        poll: str = POLL_NORMAL,
+        fmt: str = "H",
+    ) -> None:
+        """Initialize the field."""
+        self.key = key
+        self.address = address
+        # Byte offset of the value inside the block buffer
+        self.offset = offset
+        self.width = width
+        self.decode = decode
+        # Divisor applied to the raw value, None when the value is unscaled
+        self.scale = scale
+        self.poll = poll
+        # Struct format of the raw value, "<n>s" for strings
+        self.fmt = fmt
+
+    def at(self, block_start: int) -> RegisterField:
+        """Return a copy positioned inside a block starting at ``block_start``."""
+        return RegisterField(
+            self.key,
+            self.address,
+            (self.address - block_start) * 2,
+            self.width,
+            self.decode,
+            self.scale,
+            self.poll,
+            self.fmt,
+        )
+
+
+def compile_register(key: str, config: dict[str, Any]) -> RegisterField:
+    """Compile a register definition into a field decoder."""
+    width = config.get("count", 1)
+    data_type = config.get("type", "uint16")
+
+    if data_type == "string":
+        decode = _decode_string(width)
+        fmt = f"{width * 2}s"
+    else:
+        decode = _DECODERS.get(data_type, _DECODERS["uint16"])
+        fmt = _FORMATS.get(data_type, "H")
+
+    scale = config.get("scale", 1)
+    return RegisterField(
+        key,
+        config["address"],
+        0,
+        width,
+        decode,
+        float(scale) if scale != 1 else None,
+        config.get("poll", POLL_NORMAL),
+        fmt,
+    )
+
+
+# Every polled register compiled once at import
+COMPILED_REGISTERS: dict[str, RegisterField] = {
+    key: compile_register(key, config) for key, config in REGISTERS.items()
+}
+
+
+def registers_for_poll_classes(
+    poll_classes: frozenset[str] | set[str],
+) -> dict[str, RegisterField]:
+    """Return the compiled registers belonging to the given poll classes."""
+    return {
+        key: field
+        for key, field in COMPILED_REGISTERS.items()
+        if field.poll in poll_classes
+    }
+
+
+class ReadBlock:
+    """A contiguous range of holding registers fetched with one request."""
+
+    __slots__ = (
+        "start", "count", "fields", "layout_key", "_packer", "_layout", "_dtype"
+    )
+
+    def __init__(
+        self, start: int, count: int, fields: tuple[RegisterField, ...]
+    ) -> None:
+        """Initialize the block."""
+        self.start = start
+        self.count = count
+        self.fields = fields
+        # Blocks with equal keys decode buffers the same way, whichever hub
+        # planned them
+        self.layout_key = (start, count, tuple(field.key for field in fields))
+        self._packer = struct.Struct(f">{count}H")
+        self._layout = self._build_layout()
+        self._dtype: Any = None
+
+    def __repr__(self) -> str:
+        """Return a readable representation of the block."""
+        return f"ReadBlock({self.start}-{self.start + self.count - 1}, {len(self.fields)} values)"
+
+    def _build_layout(self) -> struct.Struct | None:
+        """Return one struct unpacking every field of a complete buffer."""
+        parts = [">"]
+        position = 0
+        for field in self.fields:
+            if field.offset < position:
+                # Overlapping fields cannot share one layout
+                return None
+            if field.offset > position:
+                parts.append(f"{field.offset - position}x")
+            parts.append(field.fmt)
+            position = field.offset + field.width * 2
+        if position < self.count * 2:
+            parts.append(f"{self.count * 2 - position}x")
+        return struct.Struct("".join(parts))
+
+    def _numpy_dtype(self) -> Any:
+        """Return a structured dtype matching one complete buffer."""
+        if self._dtype is None:
+            self._dtype = np.dtype(
+                {
+                    "names": [field.key for field in self.fields],
+                    "formats": [
+                        _NUMPY_FORMATS.get(field.fmt, f"S{field.width * 2}")
+                        for field in self.fields
+                    ],
+                    "offsets": [field.offset for field in self.fields],
+                    "itemsize": self.count * 2,
+                }
+            )
+        return self._dtype
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """Return the register keys covered by this block."""
+        return self.layout_key[2]
+
+    def split(self) -> list[ReadBlock]:
+        """Split the block into one block per register key."""
+        return [
+            ReadBlock(field.address, field.width, (field.at(field.address),))
+            for field in self.fields
+        ]
+
+    def pack(self, registers: list[int]) -> bytes:
+        """Pack the raw registers of a read response into a byte buffer."""
+        if len(registers) == self.count:
+            return self._packer.pack(*registers)
+        return struct.pack(f">{len(registers)}H", *registers)
+
+    def _convert(self, raw_values: tuple[Any, ...]) -> dict[str, Any]:
+        """Scale unpacked raw values and drop empty strings."""
+        data: dict[str, Any] = {}
+        for field, value in zip(self.fields, raw_values):
+            if isinstance(value, bytes):
+                value = _text(value)
+                if value is None:
+                    continue
+            elif field.scale is not None:
+                value = value / field.scale
+            data[field.key] = value
+        return data
+
+    def decode(self, buffer: bytes) -> dict[str, Any]:
+        """Decode every value of the block from its packed buffer."""
+        if self._layout is not None and len(buffer) == self._layout.size:
+            return self._convert(self._layout.unpack(buffer))
+
+        data: dict[str, Any] = {}
+        size = len(buffer)
+
+        for field in self.fields:
+            offset = field.offset
+            if offset + field.width * 2 > size:
+                continue
+            value = field.decode(buffer, offset)
+            if value is None:
+                continue
+            if field.scale is not None:
+                value = value / field.scale
+            data[field.key] = value
+
+        return data
+
+    def decode_many(self, buffers: list[bytes]) -> list[dict[str, Any]]:
+        """Decode the buffers of several devices read with this block.
+
+        Complete buffers are decoded together, column by column with numpy
+        when it is available and with one struct pass otherwise.
+        """
+        size = self.count * 2
+        if (
+            len(buffers) < 2
+            or self._layout is None
+            or any(len(buffer) != size for buffer in buffers)
+        ):
+            return [self.decode(buffer) for buffer in buffers]
+
+        joined = b"".join(buffers)
+        if np is None:
+            return [
+                self._convert(raw_values)
+                for raw_values in self._layout.iter_unpack(joined)
+            ]
+
+        records = np.frombuffer(joined, dtype=self._numpy_dtype())
+        columns = []
+        for field in self.fields:
+            column = records[field.key]
+            if field.fmt.endswith("s"):
+                columns.append([_text(raw) for raw in column.tolist()])
+            elif field.scale is not None:
+                columns.append((column / field.scale).tolist())
+            else:
+                columns.append(column.tolist())
+
+        keys = self.keys
+        return [
+            {key: value for key, value in zip(keys, row) if value is not None}
+            for row in zip(*columns)
+        ]
+
+
+def decode_buffers(buffers: list[tuple[ReadBlock, bytes]]) -> dict[str, Any]:
+    """Decode the block buffers of one device into a single mapping."""
+    data: dict[str, Any] = {}
+    for block, buffer in buffers:
+        try:
+            data.update(block.decode(buffer))
+        except Exception as err:
+            _LOGGER.debug(f"Failed to decode block {block}: {err}")
+    return data
+
+
+class DecodeBatch:
+    """Decode the polls of several devices behind one gateway together.
+
+    Every poll calls ``begin`` before reading and ``async_decode`` with its
+    block buffers afterwards. Buffers are held until no poll on the gateway
+    is reading any more, and are then decoded block by block across all
+    devices. A lone poll is decoded right away.
+
+    This couples the polls: a poll that finished reading waits for the
+    slowest overlapping poll on the gateway, but for at most
+    ``DECODE_BATCH_MAX_WAIT`` seconds. The buffers pending by then are
+    decoded without the polls still reading.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the batch."""
+        self._active = 0
+        self._pending: list[
+            tuple[list[tuple[ReadBlock, bytes]], asyncio.Future[dict[str, Any]]]
+        ] = []
+        self._deadline: asyncio.TimerHandle | None = None
+
+    def begin(self) -> None:
+        """Announce a poll that will hand in buffers."""
+        self._active += 1
+
+    def cancel(self) -> None:
+        """Withdraw a poll that will not hand in buffers."""
+        self._active -= 1
+        if not self._active and self._pending:
+            self._flush()
+
+    async def async_decode(
+        self, buffers: list[tuple[ReadBlock, bytes]]
+    ) -> dict[str, Any]:
+        """Decode the buffers of one poll, batched with overlapping polls."""
+        self._active -= 1
+        if not self._active and not self._pending:
+            return decode_buffers(buffers)
+
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending.append((buffers, future))
+        if not self._active:
+            self._flush()
+        elif self._deadline is None:
+            self._deadline = asyncio.get_running_loop().call_later(
+                DECODE_BATCH_MAX_WAIT, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        """Decode every pending poll and hand out the results."""
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        pending, self._pending = self._pending, []
+        results: list[dict[str, Any]] = [{} for _ in pending]
+        groups: dict[tuple, tuple[ReadBlock, list[tuple[int, bytes]]]] = {}
+        for index, (buffers, _) in enumerate(pending):
+            for block, buffer in buffers:
+                groups.setdefault(block.layout_key, (block, []))[1].append(
+                    (index, buffer)
+                )
+
+        for block, entries in groups.values():
+            try:
+                decoded = block.decode_many([buffer for _, buffer in entries])
+            except Exception as err:
+                _LOGGER.debug(f"Batch decode of {block} failed: {err}")
+                decoded = [decode_buffers([(block, buffer)]) for _, buffer in entries]
+            for (index, _), values in zip(entries, decoded):
+                results[index].update(values)
+
+        for (_, future), data in zip(pending, results):
+            if not future.done():
+                future.set_result(data)
+
+
+def plan_read_blocks(
+    registers: dict[str, RegisterField] | None = None,
+    max_gap: int = DEFAULT_MAX_READ_GAP,
+    max_count: int = MAX_READ_REGISTERS,
+) -> list[ReadBlock]:
+    """Group registers into the fewest contiguous read requests.
+
+    Neighbouring registers are merged while the unused registers between them
+    do not exceed ``max_gap`` and the block stays within ``max_count``.
+    """
+    if registers is None:
+        registers = COMPILED_REGISTERS
+
+    entries = sorted(registers.values(), key=lambda field: field.address)
+
+    blocks: list[ReadBlock] = []
+    start = end = 0
+    members: list[RegisterField] = []
+
+    def close_block() -> None:
+        blocks.append(
+            ReadBlock(
+                start, end - start, tuple(field.at(start) for field in members)
+            )
+        )
+
+    for field in entries:
+        address = field.address
+        if members and (
+            address - end > max_gap
+            or max(end, address + field.width) - start > max_count
+        ):
+            close_block()
+            members = []
+
+        if not members:
+            start = end = address
+        members.append(field)
+        end = max(end, address + field.width)
+
+    if members:
+        close_block()
+
+    return blocks
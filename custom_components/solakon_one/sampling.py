@@ -0,0 +1,59 @@
+"""Ring buffers of high-rate register samples for Solakon ONE."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+# Decimals kept of the mean, the finest register scale is 1/1000
+MEAN_PRECISION = 3
+
+
+class SampleBuffer:
+    """Fixed-size ring buffer of the samples of one register.
+
+    Values live in a preallocated ``array`` of doubles, so sampling never
+    allocates. Once full the oldest sample is overwritten.
+    """
+
+    __slots__ = ("_values", "_next", "count")
+
+    def __init__(self, size: int) -> None:
+        """Initialize the buffer."""
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self.count = 0
+
+    @property
+    def size(self) -> int:
+        """Return the number of samples the buffer holds."""
+        return len(self._values)
+
+    def append(self, value: float) -> None:
+        """Add a sample."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self.count < len(self._values):
+            self.count += 1
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._next = 0
+        self.count = 0
+
+    def aggregate(self) -> dict[str, Any] | None:
+        """Return mean, min, max and last of the samples, None when empty."""
+        if not self.count:
+            return None
+        # Until the buffer wraps the samples are its first ``count`` slots
+        values = (
+            self._values
+            if self.count == len(self._values)
+            else self._values[: self.count]
+        )
+        return {
+            "mean": round(sum(values) / self.count, MEAN_PRECISION),
+            "min": min(values),
+            "max": max(values),
+            "last": self._values[self._next - 1],
+            "samples": self.count,
+        }
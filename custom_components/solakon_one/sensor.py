@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import logging
+import time
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -22,12 +26,108 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SENSOR_DEFINITIONS
+from .const import (
+    DIAGNOSTIC_SENSOR_DEFINITIONS,
+    DOMAIN,
+    SAMPLE_STATS_SUFFIX,
+    SAMPLED_KEYS,
+    SENSOR_DEFINITIONS,
+)
+from .entity import SolakonEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device classes applied to measurement sensors, others (like reactive power
+# in kVar) are left without one as their unit is not accepted for the class
+_DEVICE_CLASSES = {
+    "power": SensorDeviceClass.POWER,
+    "energy": SensorDeviceClass.ENERGY,
+    "voltage": SensorDeviceClass.VOLTAGE,
+    "current": SensorDeviceClass.CURRENT,
+    "temperature": SensorDeviceClass.TEMPERATURE,
+    "frequency": SensorDeviceClass.FREQUENCY,
+    "battery": SensorDeviceClass.BATTERY,
+    "power_factor": SensorDeviceClass.POWER_FACTOR,
+}
+
+_UNITS = {
+    "kW": UnitOfPower.KILO_WATT,
+    "W": UnitOfPower.WATT,
+    "kWh": UnitOfEnergy.KILO_WATT_HOUR,
+    "V": UnitOfElectricPotential.VOLT,
+    "A": UnitOfElectricCurrent.AMPERE,
+    "Hz": UnitOfFrequency.HERTZ,
+    "°C": UnitOfTemperature.CELSIUS,
+    "%": PERCENTAGE,
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonSensorEntityDescription(SensorEntityDescription):
+    """Describes a Solakon ONE sensor and its publish throttling."""
+
+    deadband: float | None = None
+    deadband_percent: float | None = None
+    min_interval: float | None = None
+    max_interval: float | None = None
+    sampled: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor reporting a hub metric."""
+
+    factor: float = 1
+    precision: int | None = None
+
+
+def _state_class(definition: dict) -> SensorStateClass | None:
+    """Return the state class of a definition."""
+    if (state_class := definition.get("state_class")) is None:
+        return None
+    return SensorStateClass(state_class)
+
+
+SENSOR_DESCRIPTIONS = tuple(
+    SolakonSensorEntityDescription(
+        key=key,
+        name=definition["name"],
+        icon=definition.get("icon"),
+        device_class=_DEVICE_CLASSES.get(definition.get("device_class")),
+        state_class=_state_class(definition),
+        native_unit_of_measurement=_UNITS.get(
+            definition.get("unit"), definition.get("unit")
+        ),
+        deadband=definition.get("deadband"),
+        deadband_percent=definition.get("deadband_percent"),
+        min_interval=definition.get("min_interval"),
+        max_interval=definition.get("max_interval"),
+        sampled=key in SAMPLED_KEYS,
+    )
+    for key, definition in SENSOR_DEFINITIONS.items()
+)
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS = tuple(
+    SolakonDiagnosticSensorEntityDescription(
+        key=key,
+        name=definition["name"],
+        icon=definition.get("icon"),
+        device_class=(
+            SensorDeviceClass(definition["device_class"])
+            if "device_class" in definition
+            else None
+        ),
+        state_class=_state_class(definition),
+        native_unit_of_measurement=definition.get("unit"),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=definition.get("enabled_default", True),
+        factor=definition.get("factor", 1),
+        precision=definition.get("precision"),
+    )
+    for key, definition in DIAGNOSTIC_SENSOR_DEFINITIONS.items()
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -35,146 +135,173 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Solakon ONE sensor entities."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    hub = hass.data[DOMAIN][config_entry.entry_id]["hub"]
-
-    # Get device info for all sensors
-    device_info = await hub.async_get_device_info()
-    
-    entities = []
-    for key, definition in SENSOR_DEFINITIONS.items():
-        entities.append(
-            SolakonSensor(
-                coordinator,
-                config_entry,
-                key,
-                definition,
-                device_info,
-            )
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = data["coordinator"]
+    hub = data["hub"]
+    device_info = data["device_info"]
+
+    entities: list[SensorEntity] = [
+        SolakonSensor(coordinator, config_entry, description, device_info)
+        for description in SENSOR_DESCRIPTIONS
+    ]
+    entities.extend(
+        SolakonDiagnosticSensor(
+            coordinator, config_entry, hub, description, device_info
         )
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
-class SolakonSensor(CoordinatorEntity, SensorEntity):
+class SolakonSensor(SolakonEntity, SensorEntity):
     """Representation of a Solakon ONE sensor."""
 
+    entity_description: SolakonSensorEntityDescription
+
     def __init__(
         self,
         coordinator,
         config_entry: ConfigEntry,
-        sensor_key: str,
-        definition: dict,
-        device_info: dict,
+        description: SolakonSensorEntityDescription,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._sensor_key = sensor_key
-        self._definition = definition
-        self._config_entry = config_entry
-        self._device_info = device_info
-        
-        # Set unique ID and entity ID
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}"
-        self.entity_id = f"sensor.solakon_one_{sensor_key}"
-        
-        # Set basic attributes
-        self._attr_name = definition["name"]
-        self._attr_icon = definition.get("icon")
-        
-        # Set device class
-        if "device_class" in definition:
-            device_class = definition["device_class"]
-            if device_class == "power":
-                self._attr_device_class = SensorDeviceClass.POWER
-            elif device_class == "energy":
-                self._attr_device_class = SensorDeviceClass.ENERGY
-            elif device_class == "voltage":
-                self._attr_device_class = SensorDeviceClass.VOLTAGE
-            elif device_class == "current":
-                self._attr_device_class = SensorDeviceClass.CURRENT
-            elif device_class == "temperature":
-                self._attr_device_class = SensorDeviceClass.TEMPERATURE
-            elif device_class == "frequency":
-                self._attr_device_class = SensorDeviceClass.FREQUENCY
-            elif device_class == "battery":
-                self._attr_device_class = SensorDeviceClass.BATTERY
-            elif device_class == "power_factor":
-                self._attr_device_class = SensorDeviceClass.POWER_FACTOR
-        
-        # Set state class
-        if "state_class" in definition:
-            state_class = definition["state_class"]
-            if state_class == "measurement":
-                self._attr_state_class = SensorStateClass.MEASUREMENT
-            elif state_class == "total_increasing":
-                self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        
-        # Set unit of measurement
-        unit = definition.get("unit")
-        if unit == "kW":
-            self._attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
-        elif unit == "W":
-            self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        elif unit == "kWh":
-            self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        elif unit == "V":
-            self._attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
-        elif unit == "A":
-            self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
-        elif unit == "Hz":
-            self._attr_native_unit_of_measurement = UnitOfFrequency.HERTZ
-        elif unit == "°C":
-            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-        elif unit == "%":
-            self._attr_native_unit_of_measurement = PERCENTAGE
-        elif unit == "kVar":
-            self._attr_native_unit_of_measurement = "kVar"
-        elif unit:
-            self._attr_native_unit_of_measurement = unit
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._config_entry.entry_id)},
-            name=self._config_entry.data.get("name", "Solakon ONE"),
-            manufacturer=self._device_info.get("manufacturer", "Solakon"),
-            model=self._device_info.get("model", "One"),
-            sw_version=self._device_info.get("version"),
-            serial_number=self._device_info.get("serial"),
+        super().__init__(coordinator, config_entry, description, device_info)
+        self._sensor_key = description.key
+        # Aggregates of high-rate samples, present while sampling is enabled
+        self._stats_key = (
+            f"{description.key}{SAMPLE_STATS_SUFFIX}" if description.sampled else None
         )
+        self.entity_id = f"sensor.solakon_one_{description.key}"
+
+        self._published_at = time.monotonic()
+        # Set while a change is held back by the minimum interval
+        self._pending = False
+        self._attr_native_value = self._read_value()
+        self._attr_extra_state_attributes = self._read_stats()
+
+    def _read_value(self) -> Any:
+        """Return the native value from the coordinator data."""
+        if self.coordinator.data:
+            return self.coordinator.data.get(self._sensor_key)
+        return None
+
+    def _read_stats(self) -> dict[str, Any] | None:
+        """Return min, max and last of the sampled window, if any."""
+        if self._stats_key is None or not self.coordinator.data:
+            return None
+        return self.coordinator.data.get(self._stats_key)
+
+    def _is_significant(self, value: Any) -> bool:
+        """Return whether a new value differs enough from the shown one."""
+        previous = self._attr_native_value
+        if not isinstance(value, (int, float)) or not isinstance(
+            previous, (int, float)
+        ):
+            return value != previous
+
+        description = self.entity_description
+        change = abs(value - previous)
+        if description.deadband is not None and change < description.deadband:
+            return False
+        if (
+            description.deadband_percent is not None
+            and change < abs(previous) * description.deadband_percent / 100
+        ):
+            return False
+        return change > 0
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data and self._sensor_key in self.coordinator.data:
-            value = self.coordinator.data[self._sensor_key]
-            
-            # Handle special cases
-            if isinstance(value, dict):
-                # For bitfield/status values, extract meaningful data
-                if "operation" in value:
-                    self._attr_native_value = "Operating" if value["operation"] else "Standby"
-                elif "fault" in value:
-                    self._attr_native_value = "Fault" if value["fault"] else "Normal"
-                else:
-                    self._attr_native_value = str(value)
-            else:
-                self._attr_native_value = value
-                
-            # Add extra state attributes for complex values
-            if isinstance(value, dict):
-                self._attr_extra_state_attributes = value
-            else:
-                self._attr_extra_state_attributes = {}
-        else:
-            self._attr_native_value = None
-            self._attr_extra_state_attributes = {}
-        
+        status_changed = self._status_changed()
+        now = time.monotonic()
+        since_publish = now - self._published_at
+        max_interval = self.entity_description.max_interval
+        min_interval = self.entity_description.min_interval
+        heartbeat = max_interval is not None and since_publish >= max_interval
+        # A new sample window is shown even if its mean did not move, as
+        # its min and max may have caught a transient
+        new_window = self._stats_key in self.coordinator.changed_keys
+
+        if (
+            not status_changed
+            and not heartbeat
+            and not new_window
+            and not self._pending
+            and self._sensor_key not in self.coordinator.changed_keys
+        ):
+            # Nothing this sensor shows has changed
+            return
+
+        value = self._read_value()
+        if not status_changed and not heartbeat:
+            if not new_window and not self._is_significant(value):
+                self._pending = False
+                return
+            if min_interval is not None and since_publish < min_interval:
+                # Published too recently, pick the change up on a later update
+                self._pending = True
+                return
+
+        self._pending = False
+        self._published_at = now
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = self._read_stats()
         self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self._attr_native_value is not None
\ No newline at end of file
+        return self.coordinator.last_update_success and self._attr_native_value is not None
+
+
+class SolakonDiagnosticSensor(SolakonEntity, SensorEntity):
+    """Diagnostic sensor reporting a request metric of the hub."""
+
+    entity_description: SolakonDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        hub,
+        description: SolakonDiagnosticSensorEntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, description, device_info)
+        self._hub = hub
+        self.entity_id = f"sensor.solakon_one_{description.key}"
+        self._attr_native_value = self._read_metric()
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are kept locally and count failures too."""
+        return True
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """Return no attributes, metrics are never restored."""
+        return None
+
+    def _read_metric(self) -> float | None:
+        """Return the metric converted to the sensor unit."""
+        description = self.entity_description
+        value = self._hub.metrics_data.get(description.key)
+        if value is None:
+            return None
+        value *= description.factor
+        if description.precision is not None:
+            value = round(value, description.precision)
+        return value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Publish the metric when it changed."""
+        value = self._read_metric()
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
@@ -2,60 +2,80 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.switch import SwitchEntity
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, REGISTERS, SWITCH_DEFINITIONS
+from .entity import SolakonEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Solakon ONE switch entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = data["coordinator"]
-    hub = data["hub"]
+@dataclass(frozen=True, kw_only=True)
+class SolakonSwitchEntityDescription(SwitchEntityDescription):
+    """Describes a bit of a Solakon ONE register exposed as a switch."""
 
-    device_info = await hub.async_get_device_info()
+    register: str
+    bit: int
 
-    entities: list[SolakonSwitch] = []
+
+def _build_descriptions() -> tuple[SolakonSwitchEntityDescription, ...]:
+    """Compile the switch definitions into entity descriptions."""
+    descriptions = []
     for key, definition in SWITCH_DEFINITIONS.items():
-        register_key = definition["register"]
-        if register_key not in REGISTERS:
+        if definition["register"] not in REGISTERS:
             _LOGGER.warning(
-                "Skipping switch %s: register %s not defined", key, register_key
+                "Skipping switch %s: register %s not defined",
+                key,
+                definition["register"],
             )
             continue
-
-        entities.append(
-            SolakonSwitch(
-                coordinator=coordinator,
-                config_entry=config_entry,
-                hub=hub,
-                switch_key=key,
-                definition=definition,
-                device_info=device_info,
+        descriptions.append(
+            SolakonSwitchEntityDescription(
+                key=key,
+                name=definition["name"],
+                icon=definition.get("icon"),
+                register=definition["register"],
+                bit=definition["bit"],
             )
         )
+    return tuple(descriptions)
+
+
+SWITCH_DESCRIPTIONS = _build_descriptions()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Solakon ONE switch entities."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
 
-    if entities:
-        async_add_entities(entities)
+    async_add_entities(
+        SolakonSwitch(
+            data["coordinator"],
+            config_entry,
+            data["hub"],
+            description,
+            data["device_info"],
+        )
+        for description in SWITCH_DESCRIPTIONS
+    )
 
 
-class SolakonSwitch(CoordinatorEntity, SwitchEntity):
+class SolakonSwitch(SolakonEntity, SwitchEntity):
     """Representation of a writable Solakon ONE switch."""
 
+    entity_description: SolakonSwitchEntityDescription
     _attr_has_entity_name = True
 
     def __init__(
@@ -63,37 +83,31 @@ class SolakonSwitch(CoordinatorEntity, SwitchEntity):
         coordinator,
         config_entry: ConfigEntry,
         hub,
-        switch_key: str,
-        definition: dict[str, Any],
-        device_info: dict[str, Any],
+        description: SolakonSwitchEntityDescription,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the switch entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, config_entry, description, device_info)
         self._hub = hub
-        self._switch_key = switch_key
-        self._definition = definition
-        self._register_key = definition["register"]
+        self._register_key = description.register
         self._register_config = REGISTERS[self._register_key]
-        self._bit = definition["bit"]
-        self._attr_unique_id = f"{config_entry.entry_id}_{switch_key}"
-        self.entity_id = f"switch.solakon_one_{switch_key}"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=config_entry.data.get("name", "Solakon ONE"),
-            manufacturer=device_info.get("manufacturer", "Solakon"),
-            model=device_info.get("model", "One"),
-            sw_version=device_info.get("version"),
-            serial_number=device_info.get("serial"),
-        )
-
-        self._attr_name = definition["name"]
-        self._attr_icon = definition.get("icon")
+        self._bit = description.bit
+        self.entity_id = f"switch.solakon_one_{description.key}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the register or availability changed."""
+        if (
+            not self._status_changed()
+            and self._register_key not in self.coordinator.changed_keys
+        ):
+            return
+        self.async_write_ha_state()
 
     @property
     def is_on(self) -> bool:
         """Return the switch state."""
-        value = self.coordinator.data.get(self._register_key)
+        value = (self.coordinator.data or {}).get(self._register_key)
         if value is None:
             return False
         return bool(value & (1 << self._bit))
@@ -107,20 +121,16 @@ class SolakonSwitch(CoordinatorEntity, SwitchEntity):
         await self._write_bit(False)
 
     async def _write_bit(self, state: bool) -> None:
-        """Write a single bit to the Modbus register."""
-        current = self.coordinator.data.get(self._register_key, 0)
-        if state:
-            new_value = current | (1 << self._bit)
-        else:
-            new_value = current & ~(1 << self._bit)
-
-        address = self._register_config["address"]
-        success = await self._hub.async_write_register(address, new_value)
-        if not success:
+        """Set or clear the switch bit, leaving the other bits untouched."""
+        data = await self._hub.async_write_bit(self._register_key, self._bit, state)
+        if data is None:
             raise HomeAssistantError(
-                f"Failed to write value {new_value} to register {address}"
+                f"Failed to {'set' if state else 'clear'} bit {self._bit} of "
+                f"register {self._register_config['address']}"
             )
 
-        self.coordinator.data[self._register_key] = new_value
-        self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
+        if data:
+            self.coordinator.async_merge_data(data)
+        else:
+            # The device applied the change itself and the readback failed
+            await self.coordinator.async_request_refresh()
@@ -0,0 +1,169 @@
+"""Benchmark SolakonModbusHub against the simulated Solakon ONE.
+
+Measures full-poll latency, requests per poll, CPU time per decode (alone
+and per device in a batched fleet decode) and write-to-readback latency,
+so performance changes can be compared without the hardware. Requires
+pymodbus and homeassistant:
+
+    python tools/benchmark.py --polls 50 --latency 0.02
+
+The simulator does not answer overlapping requests reliably, so the
+pipeline probe falls back to depth 1 and every ``--pipeline-depth`` is
+measured sending one request at a time.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from simulator import (  # noqa: E402
+    add_device_arguments,
+    async_start_simulator,
+    async_stop_simulator,
+    device_options,
+)
+
+from custom_components.solakon_one.const import TRANSPORT_SERIAL  # noqa: E402
+from custom_components.solakon_one.modbus import SolakonModbusHub  # noqa: E402
+from custom_components.solakon_one.registers import plan_read_blocks  # noqa: E402
+
+
+def summarize(samples: list[float], scale: float = 1000) -> dict[str, float]:
+    """Return min, mean, percentiles and max of samples in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def percentile(value: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * value / 100))]
+
+    return {
+        "min": round(ordered[0] * scale, 3),
+        "mean": round(statistics.fmean(ordered) * scale, 3),
+        "p50": round(percentile(50) * scale, 3),
+        "p95": round(percentile(95) * scale, 3),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+
+def bench_decode(rounds: int) -> dict[str, float]:
+    """Return the CPU time of decoding every register block once."""
+    blocks = plan_read_blocks()
+    registers = [[0x1234] * block.count for block in blocks]
+    samples = []
+    for _ in range(rounds):
+        start = time.process_time()
+        for block, raw in zip(blocks, registers):
+            block.decode(block.pack(raw))
+        samples.append(time.process_time() - start)
+    return summarize(samples, scale=1_000_000)
+
+
+def bench_fleet_decode(devices: int, rounds: int) -> dict[str, float]:
+    """Return the CPU time per device of decoding a fleet in one batch."""
+    blocks = plan_read_blocks()
+    buffers = [
+        [block.pack([0x1234 + device] * block.count) for device in range(devices)]
+        for block in blocks
+    ]
+    samples = []
+    for _ in range(rounds):
+        start = time.process_time()
+        for block, block_buffers in zip(blocks, buffers):
+            block.decode_many(block_buffers)
+        samples.append((time.process_time() - start) / devices)
+    return summarize(samples, scale=1_000_000)
+
+
+async def async_bench_hub(args: argparse.Namespace) -> dict:
+    """Run the poll and write benchmarks against a simulator."""
+    server, device = await async_start_simulator(
+        args.host, args.port, None, args.transport, **device_options(args)
+    )
+    serial = args.transport == TRANSPORT_SERIAL
+    hub = SolakonModbusHub(
+        None,
+        server.serial_path if serial else args.host,
+        None if serial else args.port,
+        1,
+        args.scan_interval,
+        max_read_gap=args.max_read_gap,
+        pipeline_depth=args.pipeline_depth,
+        transport=args.transport,
+    )
+    try:
+        await hub.async_setup()
+
+        polls = []
+        for _ in range(args.polls):
+            hub.reset_poll_schedule()
+            start = time.perf_counter()
+            await hub.async_read_registers()
+            polls.append(time.perf_counter() - start)
+        metrics = hub.metrics_data
+
+        writes = []
+        for index in range(args.writes):
+            start = time.perf_counter()
+            data = await hub.async_write_verified("import_power_limit", index * 10)
+            if data is not None:
+                writes.append(time.perf_counter() - start)
+    finally:
+        await hub.async_close()
+        await async_stop_simulator(server)
+
+    return {
+        "full_poll_ms": summarize(polls),
+        "requests_per_poll": metrics["requests_per_poll"],
+        "request_rtt_ms": {
+            "mean": round((metrics["rtt_mean"] or 0) * 1000, 3),
+            "p95": round((metrics["rtt_p95"] or 0) * 1000, 3),
+        },
+        "errors": metrics["errors"],
+        "timeouts": metrics["timeouts"],
+        "write_readback_ms": summarize(writes),
+        "failed_writes": args.writes - len(writes),
+        "device_requests": device.requests,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--decode-rounds", type=int, default=2000)
+    parser.add_argument("--fleet", type=int, default=20, help="devices in the batch decode benchmark")
+    parser.add_argument("--scan-interval", type=int, default=30)
+    parser.add_argument("--max-read-gap", type=int, default=10)
+    parser.add_argument("--pipeline-depth", type=int, default=1, help="requested depth, only 1 verifies against the simulator")
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    add_device_arguments(parser)
+    args = parser.parse_args()
+
+    results = {
+        "decode_all_blocks_us": bench_decode(args.decode_rounds),
+        "fleet_decode_us": bench_fleet_decode(
+            args.fleet, max(1, args.decode_rounds // args.fleet)
+        ),
+    }
+    results.update(asyncio.run(async_bench_hub(args)))
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    for name, value in results.items():
+        print(f"{name:22} {value}")
+
+
+if __name__ == "__main__":
+    main()
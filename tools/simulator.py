@@ -0,0 +1,313 @@
+"""Simulated Solakon ONE Modbus TCP server for local testing and benchmarks.
+
+Serves every register of ``const.REGISTERS`` with plausible values, and can
+add latency, jitter, lost responses and request limits to mimic a real
+device or a slow gateway. With ``--transport rtu_over_tcp`` it answers RTU
+frames on the TCP port, and with ``--transport serial`` it additionally
+bridges a pseudo terminal to that port like an RS485 gateway, so the serial
+transport can be used without hardware (POSIX only).
+
+Requires pymodbus and homeassistant (for importing the integration):
+
+    python tools/simulator.py --port 5020 --latency 0.02 --jitter 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import struct
+import sys
+from pathlib import Path
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import (
+    ModbusDeviceContext,
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+)
+from pymodbus.framer import FramerType
+from pymodbus.server import ModbusTcpServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.solakon_one.const import (  # noqa: E402
+    MAX_READ_REGISTERS,
+    REGISTERS,
+    TRANSPORT_RTU_OVER_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+)
+from custom_components.solakon_one.registers import (  # noqa: E402
+    COMPILED_REGISTERS,
+    encode_register_value,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Values served for string registers
+STRINGS = {
+    "model_name": "Solakon ONE",
+    "serial_number": "SIM0000000001",
+    "manufacturer": "Solakon",
+}
+
+# Typical values per unit, used to seed numeric registers
+UNIT_VALUES = {
+    "V": 230.0,
+    "A": 2.5,
+    "W": 300,
+    "kW": 1.2,
+    "kVar": 0.1,
+    "kWh": 1234.5,
+    "Hz": 50.0,
+    "°C": 35.0,
+    "%": 55,
+}
+
+# Registers varied between reads so change detection has work to do,
+# with the largest step per update in the register unit
+VARYING = {
+    "total_pv_power": 0.05,
+    "active_power": 0.05,
+    "battery_combined_power": 20,
+    "grid_frequency": 0.02,
+    "pv1_voltage": 1.0,
+}
+
+
+def _encode_string(text: str, width: int) -> list[int]:
+    """Encode text into ``width`` registers, padded with null bytes."""
+    raw = text.encode("latin-1")[: width * 2].ljust(width * 2, b"\x00")
+    return [int.from_bytes(raw[i:i + 2], "big") for i in range(0, len(raw), 2)]
+
+
+def seed_registers() -> dict[int, int]:
+    """Return the raw register values served for every register key."""
+    registers: dict[int, int] = {}
+    for key, config in REGISTERS.items():
+        width = config.get("count", 1)
+        data_type = config.get("type", "uint16")
+        if data_type == "string":
+            values = _encode_string(STRINGS.get(key, key), width)
+        elif data_type == "bitfield16":
+            values = [0]
+        else:
+            value = UNIT_VALUES.get(config.get("unit"), 1)
+            values = encode_register_value(key, value)
+        for offset, value in enumerate(values):
+            registers[config["address"] + offset] = value
+    return registers
+
+
+class SimulatedDevice(ModbusDeviceContext):
+    """Holding registers of one simulated device with a lossy link."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        loss_delay: float = 10.0,
+        max_registers: int = MAX_READ_REGISTERS,
+        strict: bool = False,
+    ) -> None:
+        """Initialize the device."""
+        block = ModbusSequentialDataBlock(0, [0] * 0x10001)
+        super().__init__(hr=block)
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.loss_delay = loss_delay
+        self.max_registers = max_registers
+        self.strict = strict
+        self.requests = 0
+
+        self._mapped = seed_registers()
+        for address, value in self._mapped.items():
+            self.setValues(3, address, [value])
+
+    async def _async_delay(self) -> None:
+        """Wait like a device answering over the network."""
+        if self.loss and random.random() < self.loss:
+            # Answer after the client gave up, as if the reply was lost
+            await asyncio.sleep(self.loss_delay)
+            return
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def async_getValues(
+        self, func_code: int, address: int, count: int = 1
+    ) -> list[int] | ExcCodes:
+        """Return registers after the simulated delay."""
+        self.requests += 1
+        await self._async_delay()
+        if count > self.max_registers:
+            return ExcCodes.ILLEGAL_VALUE
+        if self.strict and any(
+            register not in self._mapped
+            for register in range(address, address + count)
+        ):
+            # Like devices rejecting reads across unmapped addresses
+            return ExcCodes.ILLEGAL_ADDRESS
+        return self.getValues(func_code, address, count)
+
+    async def async_setValues(
+        self, func_code: int, address: int, values: list[int]
+    ) -> None | ExcCodes:
+        """Store registers after the simulated delay."""
+        self.requests += 1
+        await self._async_delay()
+        return self.setValues(func_code, address, values)
+
+    def vary(self) -> None:
+        """Move the varying registers by a random step."""
+        for key, step in VARYING.items():
+            field = COMPILED_REGISTERS[key]
+            raw = self.getValues(3, field.address, field.width)
+            current = field.decode(struct.pack(f">{field.width}H", *raw), 0)
+            if field.scale is not None:
+                current /= field.scale
+            value = current + random.uniform(-step, step)
+            self.setValues(3, field.address, encode_register_value(key, value))
+
+
+async def _async_bridge_pty(host: str, port: int) -> tuple[str, asyncio.Task]:
+    """Bridge a new pseudo terminal to the RTU server, return its path."""
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    os.set_blocking(master, False)
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+
+    def _forward_request() -> None:
+        try:
+            writer.write(os.read(master, 4096))
+        except OSError:
+            pass
+
+    async def _async_forward_replies() -> None:
+        try:
+            while data := await reader.read(4096):
+                os.write(master, data)
+        finally:
+            loop.remove_reader(master)
+            writer.close()
+            os.close(master)
+            os.close(slave)
+
+    loop.add_reader(master, _forward_request)
+    return os.ttyname(slave), asyncio.create_task(_async_forward_replies())
+
+
+async def async_start_simulator(
+    host: str = "127.0.0.1",
+    port: int = 5020,
+    vary_interval: float | None = 1.0,
+    transport: str = TRANSPORT_TCP,
+    **device_options,
+) -> tuple[ModbusTcpServer, SimulatedDevice]:
+    """Start a simulator in the running event loop.
+
+    For the serial transport the path of the pseudo terminal is stored as
+    ``serial_path`` on the returned server.
+    """
+    device = SimulatedDevice(**device_options)
+    server = ModbusTcpServer(
+        ModbusServerContext(devices=device, single=True),
+        framer=FramerType.SOCKET if transport == TRANSPORT_TCP else FramerType.RTU,
+        address=(host, port),
+    )
+    await server.serve_forever(background=True)
+
+    if transport == TRANSPORT_SERIAL:
+        server.serial_path, server.bridge_task = await _async_bridge_pty(host, port)
+        _LOGGER.info(f"Serial line available at {server.serial_path}")
+
+    if vary_interval:
+        async def _async_vary() -> None:
+            while True:
+                await asyncio.sleep(vary_interval)
+                device.vary()
+
+        server.vary_task = asyncio.create_task(_async_vary())
+
+    _LOGGER.info(f"Simulated Solakon ONE listening on {host}:{port}")
+    return server, device
+
+
+async def async_stop_simulator(server: ModbusTcpServer) -> None:
+    """Stop a simulator started by async_start_simulator."""
+    for name in ("vary_task", "bridge_task"):
+        if task := getattr(server, name, None):
+            task.cancel()
+    await server.shutdown()
+
+
+def add_device_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the simulated link options to an argument parser."""
+    parser.add_argument(
+        "--transport",
+        choices=(TRANSPORT_TCP, TRANSPORT_RTU_OVER_TCP, TRANSPORT_SERIAL),
+        default=TRANSPORT_TCP,
+        help="framing served, serial also opens a pseudo terminal",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="share of lost replies (0-1)")
+    parser.add_argument("--loss-delay", type=float, default=10.0, help="seconds before a lost reply arrives")
+    parser.add_argument("--max-registers", type=int, default=MAX_READ_REGISTERS, help="largest read accepted")
+    parser.add_argument("--strict", action="store_true", help="reject reads over unmapped addresses")
+
+
+def device_options(args: argparse.Namespace) -> dict:
+    """Return the SimulatedDevice options from parsed arguments."""
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "loss": args.loss,
+        "loss_delay": args.loss_delay,
+        "max_registers": args.max_registers,
+        "strict": args.strict,
+    }
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    server, _ = await async_start_simulator(
+        args.host,
+        args.port,
+        args.vary_interval or None,
+        args.transport,
+        **device_options(args),
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await async_stop_simulator(server)
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--vary-interval", type=float, default=1.0, help="seconds between value changes, 0 to disable")
+    add_device_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()